@@ -7,6 +7,7 @@ from datetime import datetime
 
 from utils.permissions.handler import PermissionHandler
 from utils.helpers.formatting import EmbedBuilder, TextFormatter
+from utils.cache.memory import cache_stats, reset_cache_stats
 from discord.ext import commands
 
 class Admin(commands.Cog):
@@ -57,6 +58,22 @@ class Admin(commands.Cog):
             self.bot.settings.set_server_setting(ctx.guild.id, setting, None)
             await ctx.send(f"Cleared setting: `{setting}`")
             return
+
+        if setting == 'prefix':
+            if not value or len(value) > 5 or any(c.isspace() for c in value):
+                await ctx.send("Prefixes must be 1-5 characters with no spaces.")
+                return
+            self.bot.settings.set_server_setting(ctx.guild.id, 'prefix', value)
+            await ctx.send(f"Set `prefix` to `{value}`")
+            return
+
+        if setting == 'log_batch_window':
+            if not value or not value.isdigit() or int(value) > 10:
+                await ctx.send("The log batch window must be 0-10 seconds, 0 sends every log entry right away.")
+                return
+            self.bot.settings.set_server_setting(ctx.guild.id, 'log_batch_window', int(value))
+            await ctx.send(f"Set `log_batch_window` to `{value}s`")
+            return
             
         if ctx.message.channel_mentions:
             channel = ctx.message.channel_mentions[0]
@@ -114,6 +131,85 @@ class Admin(commands.Cog):
         
         await ctx.send(embed=embed.build())
 
+    #################################
+    ## Cache Stats Command
+    #################################
+    @commands.command(aliases=['cstats'])
+    @PermissionHandler.is_bot_master()
+    async def cachestats(self, ctx, reset: str = None):
+        """Shows hit rates, churn and size of every memory cache"""
+        stats = cache_stats()
+        if not stats:
+            return await ctx.send("No caches have been created yet")
+
+        embed = EmbedBuilder(title="Cache stats", color=discord.Color.blue())
+        for namespace, data in sorted(stats.items()):
+            embed.add_field(
+                name=namespace,
+                value=(
+                    f"```\n"
+                    f"entries   {data['entries']:,} ({data['bytes'] / 1024:,.1f} KiB)\n"
+                    f"hit rate  {data['hit_rate']:.1%}\n"
+                    f"hits      {data['hits']:,} (+{data['stale_hits']:,} stale)\n"
+                    f"misses    {data['misses']:,} ({data['coalesced']:,} coalesced)\n"
+                    f"from disk {data['disk_hits']:,} ({data['disk_hit_rate']:.1%} of misses)\n"
+                    f"evicted   {data['evictions']:,}\n"
+                    f"expired   {data['expirations']:,}\n"
+                    f"loads     {data['loads']:,} ({data['load_errors']:,} failed)\n"
+                    f"load avg  {data['avg_load_time'] * 1000:.1f}ms (max {data['max_load_time'] * 1000:.1f}ms)\n"
+                    f"```"
+                ),
+                inline=False
+            )
+
+        users = self.bot.user_resolver.stats()
+        embed.add_field(
+            name="user lookups",
+            value=(
+                f"```\n"
+                f"lookups   {users['lookups']:,}\n"
+                f"gateway   {users['gateway_hits']:,}\n"
+                f"cached    {users['cache_hits']:,} (+{users['coalesced']:,} coalesced)\n"
+                f"REST      {users['rest_calls']:,} ({users['rest_saved']:,} saved)\n"
+                f"```"
+            ),
+            inline=False
+        )
+
+        dispatch = self.bot.command_filter
+        embed.add_field(
+            name="command dispatch",
+            value=(
+                f"```\n"
+                f"messages  {dispatch.checked:,}\n"
+                f"dropped   {dispatch.short_circuited:,} before get_context\n"
+                f"```"
+            ),
+            inline=False
+        )
+
+        logging_cog = self.bot.get_cog('LoggingEvents')
+        if logging_cog is not None:
+            logs = logging_cog.batcher.stats()
+            embed.add_field(
+                name="log delivery",
+                value=(
+                    f"```\n"
+                    f"embeds    {logs['embeds_sent']:,} ({logs['pending']:,} pending, {logs['failed']:,} failed)\n"
+                    f"messages  {logs['messages_sent']:,} ({logs['calls_saved']:,} calls saved)\n"
+                    f"```"
+                ),
+                inline=False
+            )
+
+        if reset == 'reset':
+            reset_cache_stats()
+            self.bot.user_resolver.reset_stats()
+            self.bot.command_filter.reset_stats()
+            embed.set_footer("Counters have been reset")
+
+        await ctx.send(embed=embed.build())
+
     #################################
     ## Description Command
     #################################
@@ -7,6 +7,7 @@ import time
 import re
 import aiohttp
 from config import STEAM_API_KEY
+from utils.cache.memory import MemoryCache
 
 class Casual(commands.Cog):
     def __init__(self, bot):
@@ -14,6 +15,8 @@ class Casual(commands.Cog):
         self.cal = parsedatetime.Calendar()
         self.active_reminders = {}
         self.afk_users = {}
+        self.steam_cache = MemoryCache(max_entries=1000, namespace='steam', disk=bot.disk_cache)
+        self.github_cache = MemoryCache(max_entries=1000, namespace='github', disk=bot.disk_cache)
         
     #################################
     ## About Command
@@ -85,7 +88,7 @@ class Casual(commands.Cog):
                 user = ctx.author
             else:
                 user_id = user_id.strip('<@!>')
-                user = await self.bot.fetch_user(int(user_id))
+                user = await self.bot.user_resolver.resolve(int(user_id), ctx.guild)
             
             member = ctx.guild.get_member(user.id) if ctx.guild else None
             
@@ -130,7 +133,7 @@ class Casual(commands.Cog):
                 user = ctx.author
             else:
                 user_id = user_id.strip('<@!>')
-                user = await self.bot.fetch_user(int(user_id))
+                user = await self.bot.user_resolver.resolve(int(user_id), ctx.guild)
 
             member = ctx.guild.get_member(user.id) if ctx.guild else None
 
@@ -154,11 +157,9 @@ class Casual(commands.Cog):
     async def banner(self, ctx, user_id: str = None):
         """Get a user's banner"""
         try:
-            if user_id is None:
-                user = ctx.author
-            else:
-                user_id = user_id.strip('<@!>')
-                user = await self.bot.fetch_user(int(user_id))
+            # Banners only come back from REST, gateway users never have one set
+            user_id = ctx.author.id if user_id is None else int(user_id.strip('<@!>'))
+            user = await self.bot.user_resolver.resolve(user_id, full=True)
 
             if not user.banner:
                 await ctx.send(f"**{user.name}** doesn't have a banner!")
@@ -399,9 +400,12 @@ class Casual(commands.Cog):
         if message.author.bot:
             return
 
-        ctx = await self.bot.get_context(message)
-        if ctx.valid and ctx.command and ctx.command.name == 'afk':
-            return
+        # Setting AFK must not immediately clear it; check the invoked name without building a Context
+        prefix = self.bot.prefixes.match(message)
+        if prefix is not None:
+            invoked = message.content[len(prefix):].split(maxsplit=1)
+            if invoked and self.bot.get_command(invoked[0]) is self.afk:
+                return
 
         if message.author.id in self.afk_users:
             del self.afk_users[message.author.id]
@@ -420,7 +424,7 @@ class Casual(commands.Cog):
                     time_str += f"{hours}h "
                 time_str += f"{minutes}m ago"
                 
-                await ctx.reply(
+                await message.reply(
                     f"{mention.display_name} is AFK: **{afk_data['message']}**\n**{time_str}**"
                 )
 
@@ -459,37 +463,28 @@ class Casual(commands.Cog):
             return
         
         if "steamcommunity.com" not in steam_id and not steam_id.isdigit():
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/?key={STEAM_API_KEY}&vanityurl={steam_id}"
-                ) as resp:
-                    data = await resp.json()
-                    if data['response'].get('success') == 1:
-                        steam_id = data['response']['steamid']
-                    else:
-                        await ctx.send("Could not find Steam profile!")
-                        return
+            steam_id = await self.resolve_steam_vanity(steam_id)
+            if not steam_id:
+                await ctx.send("Could not find Steam profile!")
+                return
         elif "steamcommunity.com" in steam_id:
             if "/id/" in steam_id:
                 custom_url = steam_id.split("/id/")[1].split("/")[0]
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        f"https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/?key={STEAM_API_KEY}&vanityurl={custom_url}"
-                    ) as resp:
-                        data = await resp.json()
-                        if data['response'].get('success') == 1:
-                            steam_id = data['response']['steamid']
-                        else:
-                            await ctx.send("Could not find Steam profile!")
-                            return
+                steam_id = await self.resolve_steam_vanity(custom_url)
+                if not steam_id:
+                    await ctx.send("Could not find Steam profile!")
+                    return
             elif "/profiles/" in steam_id:
                 steam_id = steam_id.split("/profiles/")[1].split("/")[0]
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/?key={STEAM_API_KEY}&steamids={steam_id}"
-            ) as resp:
-                data = await resp.json()
+        async def load_player():
+            async with aiohttp.ClientSession() as session:
+                async with session.get(
+                    f"https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/?key={STEAM_API_KEY}&steamids={steam_id}"
+                ) as resp:
+                    return await resp.json()
+
+        data = await self.steam_cache.get_or_load(f"player:{steam_id}", load_player, ttl=300)
                 
         if not data['response']['players']:
             await ctx.send("Could not find Steam profile!")
@@ -562,6 +557,20 @@ class Casual(commands.Cog):
         
         await ctx.send(embed=embed)
 
+    async def resolve_steam_vanity(self, vanity: str):
+        """Resolve a custom profile URL to a Steam ID, cached for a day"""
+        async def load():
+            async with aiohttp.ClientSession() as session:
+                async with session.get(
+                    f"https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/?key={STEAM_API_KEY}&vanityurl={vanity}"
+                ) as resp:
+                    data = await resp.json()
+                    if data['response'].get('success') == 1:
+                        return data['response']['steamid']
+            return None
+
+        return await self.steam_cache.get_or_load(f"vanity:{vanity.lower()}", load, ttl=86400, negative_ttl=600)
+
     #################################
     ## GitHub Command
     #################################
@@ -569,12 +578,24 @@ class Casual(commands.Cog):
     async def github(self, ctx, *, username: str):
         """Display a GitHub profile"""
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"https://api.github.com/users/{username}") as resp:
-                if resp.status != 200:
-                    await ctx.send("Could not find GitHub profile!")
-                    return
-                data = await resp.json()
+        async def load():
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"https://api.github.com/users/{username}") as resp:
+                    # Only a 404 is a real miss, rate limits and outages raise so they aren't cached
+                    if resp.status == 404:
+                        return None
+                    resp.raise_for_status()
+                    return await resp.json()
+
+        try:
+            data = await self.github_cache.get_or_load(username.lower(), load, ttl=3600, negative_ttl=600)
+        except aiohttp.ClientError as e:
+            print(f"Error fetching GitHub profile {username}: {e}")
+            await ctx.send("GitHub isn't answering right now, try again in a bit.")
+            return
+        if not data:
+            await ctx.send("Could not find GitHub profile!")
+            return
                 
         embed = discord.Embed(
             title=data['login'],
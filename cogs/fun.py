@@ -10,10 +10,12 @@ import re
 from discord.ext import commands
 from utils.helpers.formatting import EmbedBuilder, TextFormatter
 from utils.permissions.handler import PermissionHandler
+from utils.cache.memory import MemoryCache
 
 class Fun(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.urban_cache = MemoryCache(max_entries=1000, namespace='urban', disk=bot.disk_cache)
         self.eight_ball_responses = [
             "It is certain.", "It is decidedly so.", "Without a doubt.",
             "Yes definitely.", "You may rely on it.", "As I see it, yes.",
@@ -589,11 +591,14 @@ class Fun(commands.Cog):
     async def urban(self, ctx, *, word: str):
         """Search Urban Dictionary for a word"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"https://api.urbandictionary.com/v0/define?term={urllib.parse.quote(word)}"
-                ) as resp:
-                    data = await resp.json()
+            async def load():
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(
+                        f"https://api.urbandictionary.com/v0/define?term={urllib.parse.quote(word)}"
+                    ) as resp:
+                        return await resp.json()
+
+            data = await self.urban_cache.get_or_load(word.lower(), load, ttl=86400)
                     
             if not data['list']:
                 await ctx.send("No results found!")
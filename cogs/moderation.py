@@ -2,142 +2,96 @@ import discord
 import random
 import json
 import re
-import base64
 import time
 from typing import Union
 import asyncio
 
 from utils.helpers import PermissionHandler
 from discord.ext import commands
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from utils.helpers.formatting import TextFormatter, EmbedBuilder
 from utils.helpers.time import TimeParser
+from utils.moderation.bans import bulk_ban, ProgressMessage
+from utils.moderation.members import MemberCriteria, MemberIndexes
+from utils.moderation.tempbans import TempbanScheduler
+from utils.moderation.purge import PurgeFilter, purge_channel, purge_channels
+from utils.moderation.roles import RoleIndexes
 
 
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.mod_log_file = "data/mod_logs.json"
-        self.last_case_time = 0
-        self.case_counter = 0
+        self.cases = bot.cases
+        self.member_indexes = MemberIndexes()
+        self.role_indexes = RoleIndexes()
+        self.tempbans = TempbanScheduler(bot, bot.cases, on_expired=self.log_tempban_expiry)
 
-    def generate_case_id(self) -> str:
-        """Generate a unique case ID based on timestamp"""
-        current_time = int(time.time())
-        
-        if current_time == self.last_case_time:
-            self.case_counter += 1
-        else:
-            self.last_case_time = current_time
-            self.case_counter = 0
-        
-        unique_num = (current_time << 16) | (self.case_counter << 8) | random.randint(0, 255)
-        case_id = base64.b32encode(unique_num.to_bytes(8, 'big')).decode('utf-8').rstrip('=')[:8]
-        return case_id
+    async def cog_unload(self):
+        self.tempbans.stop()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self.tempbans.start()
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.member_indexes.add(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.member_indexes.remove(member)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.member_indexes.drop(guild.id)
+        self.role_indexes.invalidate(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self.role_indexes.invalidate(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        if before.name != after.name or before.position != after.position:
+            self.role_indexes.invalidate(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.role_indexes.invalidate(role.guild.id)
 
     async def save_mod_action(self, guild_id: int, action: dict):
         """Save a moderation action to the records"""
-        try:
-            with open(self.mod_log_file, 'r') as f:
-                records = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            records = {}
-
-        guild_id = str(guild_id)
-        if guild_id not in records:
-            records[guild_id] = {'cases': {}, 'users': {}}
-
-        case_id = self.generate_case_id()
-        action['case_id'] = case_id
-        action['timestamp'] = datetime.utcnow().isoformat()
-        
-        records[guild_id]['cases'][case_id] = action
-        
-        user_id = str(action['user_id'])
-        user = await self.bot.fetch_user(action['user_id'])
-        
-        if user_id not in records[guild_id]['users']:
-            records[guild_id]['users'][user_id] = {
-                'username': f"{user.name}#{user.discriminator}" if user.discriminator != '0' else user.name,
-                'case_ids': []
-            }
-        else:
-            records[guild_id]['users'][user_id]['username'] = f"{user.name}#{user.discriminator}" if user.discriminator != '0' else user.name
-                
-        records[guild_id]['users'][user_id]['case_ids'].append(case_id)
-
-        with open(self.mod_log_file, 'w') as f:
-            json.dump(records, f, indent=2)
-            
-        return case_id
+        guild = self.bot.get_guild(guild_id)
+        user = await self.bot.user_resolver.resolve(action['user_id'], guild)
+        action['username'] = f"{user.name}#{user.discriminator}" if user.discriminator != '0' else user.name
+        return await self.cases.add(guild_id, action)
 
     @commands.command(aliases=['history', 'infractions'])
     @PermissionHandler.has_permissions(kick_members=True)
-    async def records(self, ctx, user: Union[discord.Member, discord.User, str]):
+    async def records(self, ctx, user: Union[discord.Member, str]):
         """View a member's moderation record"""
         try:
             if isinstance(user, str):
                 if user.isdigit():
-                    user = await self.bot.fetch_user(int(user))
+                    user = await self.bot.user_resolver.resolve(int(user), ctx.guild)
                 else:
                     mention_match = re.match(r'<@!?(\d+)>', user)
                     if mention_match:
-                        user = await self.bot.fetch_user(int(mention_match.group(1)))
+                        user = await self.bot.user_resolver.resolve(int(mention_match.group(1)), ctx.guild)
                     else:
                         await ctx.send("Please provide a valid user ID or mention.")
                         return
 
-            with open(self.mod_log_file, 'r') as f:
-                records = json.load(f)
-
-            guild_records = records.get(str(ctx.guild.id), {})
-            user_data = guild_records.get('users', {}).get(str(user.id))
-
-            if not user_data or not user_data.get('case_ids', []):
+            if not self.cases.count_for_user(ctx.guild.id, user.id):
                 await ctx.send(f"No moderation records found for {user.mention}")
                 return
 
-            embed = discord.Embed(
-                title=f"Member records | Page 1/1",
-                color=0x2B2D31,
-                timestamp=datetime.utcnow()
-            )
-            
-            embed.description = f"**{user.name}**\nMention: {user.mention}\n```javascript\nID: {user.id}```\n**Total records:** {len(user_data['case_ids'])}"
-            embed.set_thumbnail(url=user.display_avatar.url)
-
-            cases = guild_records.get('cases', {})
-            cases_to_show = user_data['case_ids'][-10:]
-            cases_to_show.reverse()
-            
-            for case_id in cases_to_show:
-                if case_id not in cases:
-                    continue
-                    
-                record = cases[case_id]
-                action_time = datetime.fromisoformat(record['timestamp'])
-                moderator = ctx.guild.get_member(record['mod_id'])
-                mod_name = moderator.name if moderator else "Unknown moderator"
-
-                embed.add_field(
-                    name=f"**{record['action']}**",
-                    value=(
-                        f"**Case ID:** `{case_id}`\n"
-                        f"**Moderator:** {moderator.mention if moderator else mod_name}\n"
-                        f"When: {discord.utils.format_dt(action_time)}\n"
-                        f"> **Reason:**\n> {record['reason'] or 'No reason provided'}"
-                        + (f"\n> **Duration:** {record['duration']}" if 'duration' in record else "")
-                    ),
-                    inline=False
-                )
-
-            embed.set_footer(text=f"Most recent {min(len(user_data['case_ids']), 10)} of {len(user_data['case_ids'])} records")
-            await ctx.send(embed=embed)
+            view = self.RecordsView(ctx.author, self.cases, ctx.guild, user)
+            if view.pages == 1:
+                await ctx.send(embed=view.build(0))
+                return
+            view.message = await ctx.send(embed=view.build(0), view=view)
 
-        except FileNotFoundError:
-            await ctx.send("No moderation records exist yet")
-        except json.JSONDecodeError:
-            await ctx.send("Error reading moderation records")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
 
@@ -146,23 +100,18 @@ class Moderation(commands.Cog):
     async def editrecord(self, ctx, case_id: str, *, new_reason: str):
         """Edit the reason for a moderation case"""
         try:
-            with open(self.mod_log_file, 'r') as f:
-                records = json.load(f)
-                
-            guild_records = records.get(str(ctx.guild.id), {})
-            case = guild_records.get('cases', {}).get(case_id)
+            case = await self.cases.edit(
+                ctx.guild.id,
+                case_id,
+                reason=new_reason,
+                edited_by=ctx.author.id,
+                edited_at=datetime.utcnow().isoformat()
+            )
             
             if not case:
                 await ctx.send(f"Case ID `{case_id}` not found.")
                 return
             
-            case['reason'] = new_reason
-            case['edited_by'] = ctx.author.id
-            case['edited_at'] = datetime.utcnow().isoformat()
-            
-            with open(self.mod_log_file, 'w') as f:
-                json.dump(records, f, indent=2)
-            
             user = ctx.guild.get_member(case['user_id']) or await ctx.guild.fetch_member(case['user_id'])
             mod = ctx.guild.get_member(case['mod_id'])
             
@@ -246,10 +195,10 @@ class Moderation(commands.Cog):
         
         if user_input.startswith('<@') and user_input.endswith('>'):
             user_id = int(user_input[2:-1].replace('!', ''))
-            user = ctx.guild.get_member(user_id) or await self.bot.fetch_user(user_id)
+            user = await self.bot.user_resolver.resolve(user_id, ctx.guild)
         elif user_input.isdigit():
             user_id = int(user_input)
-            user = ctx.guild.get_member(user_id) or await self.bot.fetch_user(user_id)
+            user = await self.bot.user_resolver.resolve(user_id, ctx.guild)
         else:
             user = discord.utils.find(
                 lambda m: str(m) == user_input or m.name == user_input,
@@ -520,35 +469,6 @@ class Moderation(commands.Cog):
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
 
-    def find_best_match(self, input_str, roles):
-        """Find the best matching role using fuzzy matching"""
-        search_term = input_str.lower()
-        best_match = None
-        highest_similarity = 0
-
-        for role in roles:
-            role_name = role.name.lower()
-            if role_name in search_term or search_term in role_name:
-                similarity = max(len(role_name) / len(search_term), len(search_term) / len(role_name))
-                if similarity > highest_similarity:
-                    highest_similarity = similarity
-                    best_match = role
-                continue
-
-            max_length = max(len(role_name), len(search_term))
-            distance = 0
-            for i in range(min(len(role_name), len(search_term))):
-                if role_name[i] != search_term[i]:
-                    distance += 1
-            distance += abs(len(role_name) - len(search_term))
-
-            similarity = 1 - (distance / max_length)
-            if similarity > highest_similarity and similarity > 0.5:
-                highest_similarity = similarity
-                best_match = role
-
-        return best_match
-
     @commands.command()
     @PermissionHandler.has_permissions(manage_roles=True)
     async def role(self, ctx, member: discord.Member, *, role_input: str):
@@ -561,9 +481,7 @@ class Moderation(commands.Cog):
             elif role_input.isdigit():
                 role = ctx.guild.get_role(int(role_input))
             else:
-                role = discord.utils.find(lambda r: r.name.lower() == role_input.lower(), ctx.guild.roles)
-                if not role:
-                    role = self.find_best_match(role_input, ctx.guild.roles)
+                role = self.role_indexes.find(ctx.guild, role_input)
 
             if not role:
                 await ctx.send("Could not find that role")
@@ -587,22 +505,44 @@ class Moderation(commands.Cog):
 
     @commands.group(invoke_without_command=True)
     @PermissionHandler.has_permissions(manage_messages=True)
-    async def purge(self, ctx, search: int = 100, member: discord.Member = None):
-        """Purge messages. If member is specified, only purge their messages"""
+    async def purge(self, ctx, search: int = 100, *, args: str = None):
+        """
+        Purge messages. Mention members to only purge theirs, criteria can be combined:
+        --user @x --bots --humans --prefix ! --contains foo --regex expr --links --emoji
+        --embeds --files --mentions --after <id> --before <id> --pinned
+        """
+        try:
+            def resolve_member(name):
+                member = ctx.guild.get_member_named(name)
+                return member.id if member else None
+
+            purge_filter = PurgeFilter.from_flags(args or '', TextFormatter.parse_flags(args or ''), resolve_member)
+        except ValueError as e:
+            await ctx.send(str(e))
+            return
+
+        await self.run_purge(ctx, search, purge_filter)
+
+    async def run_purge(self, ctx, search: int, purge_filter: PurgeFilter, target: discord.Member = None):
+        """Purge the current channel with a compiled filter, the command message goes with the first chunk"""
         if search > 1000:
             await ctx.send("Cannot delete more than 1000 messages at once")
             return
-            
-        def check(message):
-            if message.pinned:
-                return False
-            if member:
-                return message.author == member
-            return True
+
+        check = purge_filter.compile()
+        command_id = ctx.message.id
 
         try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
-            await self.log_bulk_delete(ctx, len(deleted) - 1, member)
+            deleted = await purge_channel(
+                ctx.channel,
+                search + 1,
+                lambda message: message.id == command_id or check(message),
+                before=purge_filter.before,
+                after=purge_filter.after
+            )
+            count = sum(1 for message in deleted if message.id != command_id)
+            await ctx.send(f"Deleted {count} messages", delete_after=5)
+            await self.log_bulk_delete(ctx, count, target, purge_filter.describe())
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
 
@@ -610,132 +550,115 @@ class Moderation(commands.Cog):
     @PermissionHandler.has_permissions(manage_messages=True)
     async def purge_bot(self, ctx, search: int = 100, prefix: str = None):
         """Purge bot messages and messages with prefix"""
-        def check(message):
-            if message.pinned:
-                return False
-            if message.author.bot:
-                return True
-            if prefix and message.content.startswith(prefix):
-                return True
-            return False
-
-        try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
-            await self.log_bulk_delete(ctx, len(deleted) - 1, None, f"Bot messages {f'with prefix {prefix}' if prefix else ''}")
-        except Exception as e:
-            await ctx.send(f"An error occurred: {str(e)}")
+        await self.run_purge(ctx, search, PurgeFilter(bots=True, prefix=prefix))
 
     @purge.command(name='contains')
     @PermissionHandler.has_permissions(manage_messages=True)
     async def purge_contains(self, ctx, search: int = 100, *, substring: str):
         """Purge messages containing substring"""
-        def check(message):
-            return not message.pinned and substring.lower() in message.content.lower()
-
-        try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
-            await self.log_bulk_delete(ctx, len(deleted) - 1, None, f"Messages containing: {substring}")
-        except Exception as e:
-            await ctx.send(f"An error occurred: {str(e)}")
+        await self.run_purge(ctx, search, PurgeFilter(contains=substring))
 
     @commands.command()
     @PermissionHandler.has_permissions(manage_messages=True)
     async def cleanup(self, ctx, search: int = 100):
         """Cleanup bot messages"""
-        def check(message):
-            return message.author == ctx.bot.user
-
-        try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
-            await self.log_bulk_delete(ctx, len(deleted) - 1, ctx.bot.user)
-        except Exception as e:
-            await ctx.send(f"An error occurred: {str(e)}")
+        await self.run_purge(ctx, search, PurgeFilter(users={ctx.bot.user.id}, pinned=True), ctx.bot.user)
 
     @purge.command(name='embeds')
     @PermissionHandler.has_permissions(manage_messages=True)
     async def purge_embeds(self, ctx, search: int = 100):
         """Purge messages with embeds"""
-        def check(message):
-            return not message.pinned and (message.embeds or message.attachments)
-
-        try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
-            await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Messages with embeds")
-        except Exception as e:
-            await ctx.send(f"An error occurred: {str(e)}")
+        await self.run_purge(ctx, search, PurgeFilter(embeds=True))
 
     @purge.command(name='emoji')
     @PermissionHandler.has_permissions(manage_messages=True)
     async def purge_emoji(self, ctx, search: int = 100):
         """Purge messages containing custom emoji"""
-        def check(message):
-            return not message.pinned and re.search(r'<a?:\w+:\d+>', message.content)
-
-        try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
-            await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Messages with custom emoji")
-        except Exception as e:
-            await ctx.send(f"An error occurred: {str(e)}")
+        await self.run_purge(ctx, search, PurgeFilter(emoji=True))
 
     @purge.command(name='files')
     @PermissionHandler.has_permissions(manage_messages=True)
     async def purge_files(self, ctx, search: int = 100):
         """Purge messages with attachments"""
-        def check(message):
-            return not message.pinned and message.attachments
-
-        try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
-            await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Messages with attachments")
-        except Exception as e:
-            await ctx.send(f"An error occurred: {str(e)}")
+        await self.run_purge(ctx, search, PurgeFilter(files=True))
 
     @purge.command(name='links')
     @PermissionHandler.has_permissions(manage_messages=True)
     async def purge_links(self, ctx, search: int = 100):
         """Purge messages containing links"""
-        def check(message):
-            return not message.pinned and re.search(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', message.content)
-
-        try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
-            await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Messages with links")
-        except Exception as e:
-            await ctx.send(f"An error occurred: {str(e)}")
+        await self.run_purge(ctx, search, PurgeFilter(links=True))
 
     @purge.command(name='mentions', aliases=['pings'])
     @PermissionHandler.has_permissions(manage_messages=True)
     async def purge_mentions(self, ctx, search: int = 100):
         """Purge messages containing mentions"""
-        def check(message):
-            return not message.pinned and (message.mentions or message.role_mentions or message.mention_everyone)
-
-        try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
-            await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Messages with mentions")
-        except Exception as e:
-            await ctx.send(f"An error occurred: {str(e)}")
+        await self.run_purge(ctx, search, PurgeFilter(mentions=True))
 
     @purge.command(name='humans')
     @PermissionHandler.has_permissions(manage_messages=True)
     async def purge_humans(self, ctx, search: int = 100):
         """Purge messages by humans"""
-        def check(message):
-            return not message.pinned and not message.author.bot
+        await self.run_purge(ctx, search, PurgeFilter(humans=True))
 
-        try:
-            deleted = await ctx.channel.purge(limit=search + 1, check=check)
-            await self.log_bulk_delete(ctx, len(deleted) - 1, None, "Human messages")
-        except Exception as e:
-            await ctx.send(f"An error occurred: {str(e)}")
+    @purge.command(name='everywhere', aliases=['all'])
+    @PermissionHandler.has_permissions(manage_messages=True)
+    async def purge_everywhere(self, ctx, member: discord.User, window: str = '1h'):
+        """Purge a member's messages from every channel within a time window (e.g. 30m, 2h, 1d)"""
+        seconds = TimeParser.parse_time_string(window)
+        if not seconds:
+            await ctx.send("Invalid window format. Use combinations of w/d/h/m/s (e.g., 2h)")
+            return
+
+        me = ctx.guild.me
+        channels = [
+            channel for channel in [*ctx.guild.text_channels, *ctx.guild.threads]
+            if channel.permissions_for(me).read_message_history and channel.permissions_for(me).manage_messages
+        ]
+        status = await ctx.send(f"Scanning {len(channels)} channels for messages from **{member.name}**...")
+
+        purge_filter = PurgeFilter(users={member.id})
+        counts = await purge_channels(
+            channels,
+            1000,
+            purge_filter.compile(),
+            after_time=datetime.now(timezone.utc) - timedelta(seconds=seconds)
+        )
+
+        total = sum(counts.values())
+        await status.edit(content=f"Deleted {total} messages from **{member.name}** in {len(counts)} channels")
+        await self.log_bulk_delete(ctx, total, member, f"Last {TimeParser.format_duration(seconds)}", per_channel=counts)
 
-    async def log_bulk_delete(self, ctx, count: int, target: discord.Member = None, filter_info: str = None):
-        """Helper function to log bulk message deletions"""
+    async def log_bulk_delete(self, ctx, count: int, target: discord.Member = None, filter_info: str = None, per_channel: dict = None):
+        """Log one audit embed for a purge, with a per-channel breakdown when it spanned several"""
         log_channel_id = self.bot.settings.get_server_setting(ctx.guild.id, "log_channel_mod_audit")
         if not log_channel_id:
             return
-        
-        await ctx.send(f"Deleted {count} messages")
+
+        channel = ctx.guild.get_channel(int(log_channel_id))
+        if not channel:
+            return
+
+        if per_channel:
+            lines = [
+                f"{purged.mention}: {channel_count}"
+                for purged, channel_count in sorted(per_channel.items(), key=lambda item: item[1], reverse=True)
+            ]
+            where = f"**Channels:** {len(per_channel)}\n" + "\n".join(lines)
+        else:
+            where = f"**Channel:** {ctx.channel.mention}"
+
+        embed = EmbedBuilder(
+            title=f"Purged {count} messages",
+            description=TextFormatter.truncate(
+                f"**Moderator:** {ctx.author.mention}\n`{ctx.author.id}`\n"
+                + (f"**User:** {target.mention}\n`{target.id}`\n" if target else "")
+                + (f"**Filter:** {filter_info}\n" if filter_info else "")
+                + f"\n{where}",
+                4000
+            )
+        ).build()
+        embed.color = 0x2B2D31
+        await channel.send(embed=embed)
 
     @commands.command(aliases=['setnote'])
     @PermissionHandler.has_permissions(kick_members=True)
@@ -916,8 +839,9 @@ class Moderation(commands.Cog):
                 'action': 'Tempban',
                 'reason': reason,
                 'duration': TimeParser.format_duration(seconds),
-                'expires_at': int((datetime.utcnow() + timedelta(seconds=seconds)).timestamp())
+                'expires_at': int(time.time()) + seconds
             })
+            self.tempbans.schedule(ctx.guild.id, self.cases.get(ctx.guild.id, case_id))
             
             await self.log_mod_action(
                 ctx, 
@@ -925,16 +849,10 @@ class Moderation(commands.Cog):
                 member, 
                 case_id, 
                 reason=reason,
-                duration=TimeParser.format_duration(seconds)
+                duration=TimeParser.format_duration(seconds),
+                expires_at=int(time.time()) + seconds
             )
 
-            await asyncio.sleep(seconds)
-            try:
-                await ctx.guild.unban(member)
-                await self.log_mod_action(ctx, "Tempban expired", member, case_id)
-            except:
-                pass
-
             await ctx.reply(f"**{member.name}** was tempbanned for {TimeParser.format_duration(seconds)}")
 
         except discord.Forbidden:
@@ -945,9 +863,27 @@ class Moderation(commands.Cog):
     @commands.command()
     @PermissionHandler.has_permissions(ban_members=True)
     async def massban(self, ctx, days: int = 2, *, args):
-        """Ban multiple members at once"""
+        """
+        Ban multiple members at once, by mention/ID or by criteria
+        Criteria: --joined 30m --created 7d --name regex --no-avatar --reason text
+        """
         members = []
         reason = None
+
+        if '--' in args:
+            flags = TextFormatter.parse_flags(args)
+            try:
+                criteria = MemberCriteria.from_flags(flags)
+            except ValueError as e:
+                await ctx.send(str(e))
+                return
+            if criteria.empty:
+                await ctx.send("Give at least one of `--joined`, `--created`, `--name` or `--no-avatar`.")
+                return
+
+            members = criteria.select(ctx.guild, self.member_indexes)
+            reason = flags.get('reason') if isinstance(flags.get('reason'), str) else None
+            args = args[:args.find('--')]
         
         parts = args.split()
         for part in parts:
@@ -968,10 +904,11 @@ class Moderation(commands.Cog):
                     continue
             else:
                 reason_start = args.find(part)
-                if reason_start != -1:
-                    reason = args[reason_start:]
+                if reason_start != -1 and not reason:
+                    reason = args[reason_start:].strip()
                 break
 
+        members = list({member.id: member for member in members}.values())
         if not members:
             await ctx.send("No valid members provided!")
             return
@@ -985,34 +922,39 @@ class Moderation(commands.Cog):
                 await interaction.response.send_message("This is not for you!", ephemeral=True)
                 return
 
-            success = []
-            failed = []
-            for member in members:
-                try:
-                    if member.top_role >= ctx.author.top_role:
-                        failed.append(f"{member.name} (higher role)")
-                        continue
-                        
-                    await member.ban(reason=reason, delete_message_days=days)
-                    case_id = await self.save_mod_action(ctx.guild.id, {
-                        'user_id': member.id,
-                        'mod_id': ctx.author.id,
-                        'action': 'Massban',
-                        'reason': reason
-                    })
-                    await self.log_mod_action(ctx, "Massban", member, case_id, reason=reason)
-                    success.append(member.name)
-                except:
-                    failed.append(member.name)
+            await interaction.response.defer()
+
+            targets = [member for member in members if member.top_role < ctx.author.top_role]
+            failed = [f"{member.name} (higher role)" for member in members if member.top_role >= ctx.author.top_role]
 
-            report = f"Banned {len(success)} members"
-            if success:
-                report += f"\nSuccess: {', '.join(success[:10])}" + ("..." if len(success) > 10 else "")
+            banned, ban_failed = await bulk_ban(
+                ctx.guild,
+                targets,
+                reason=reason,
+                delete_message_seconds=days * 86400,
+                on_progress=ProgressMessage(confirm_message, "Banning")
+            )
+            failed.extend(member.name for member in ban_failed)
+
+            case_ids = await self.cases.add_many(ctx.guild.id, [
+                {
+                    'user_id': member.id,
+                    'username': member.name,
+                    'mod_id': ctx.author.id,
+                    'action': 'Massban',
+                    'reason': reason
+                }
+                for member in banned
+            ])
+            await self.log_mass_action(ctx, "Massban", banned, case_ids, reason=reason)
+
+            report = f"Banned {len(banned)} members"
+            if banned:
+                report += f"\nSuccess: {', '.join(member.name for member in banned[:10])}" + ("..." if len(banned) > 10 else "")
             if failed:
                 report += f"\nFailed: {', '.join(failed[:10])}" + ("..." if len(failed) > 10 else "")
                 
             await confirm_message.edit(content=report, view=None)
-            await interaction.response.defer()
 
         async def cancel_callback(interaction):
             if interaction.user != ctx.author:
@@ -1037,27 +979,31 @@ class Moderation(commands.Cog):
     @PermissionHandler.has_permissions(kick_members=True)
     async def warns(self, ctx, member: discord.Member = None):
         """List warnings for a member or the whole server"""
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
-        mod_logs = settings.get('mod_logs', {})
+        await self.migrate_settings_warns(ctx.guild.id)
         
         if member:
-            warnings = [log for log in mod_logs.values() if log.get('action') == 'Warn' and log.get('user_id') == member.id]
+            total = self.cases.count_for_user_action(ctx.guild.id, member.id, 'Warn')
+            warnings = self.cases.for_user_action(ctx.guild.id, member.id, 'Warn', limit=10)
             if not warnings:
                 return await ctx.send(f"**{member.name}** has no warnings.")
             embed = discord.Embed(title=f"Warnings for **{member.name}**", color=discord.Color.yellow())
         else:
-            warnings = [log for log in mod_logs.values() if log.get('action') == 'Warn']
+            total = self.cases.count_for_action(ctx.guild.id, 'Warn')
+            warnings = self.cases.for_action(ctx.guild.id, 'Warn', limit=10)
             if not warnings:
                 return await ctx.send("No warnings in this server.")
             embed = discord.Embed(title="Server Warnings", color=discord.Color.yellow())
             
-        for warn in warnings[-10:]:
+        for warn in warnings:
             mod = ctx.guild.get_member(warn.get('mod_id'))
             embed.add_field(
                 name=f"Case {warn.get('case_id')}",
                 value=f"**Moderator:** {mod.mention if mod else 'Unknown'}\n**Reason:** {warn.get('reason') or 'No reason provided'}",
                 inline=False
             )
+        
+        if total > len(warnings):
+            embed.set_footer(text=f"Most recent {len(warnings)} of {total} warnings")
             
         await ctx.send(embed=embed)
 
@@ -1065,16 +1011,13 @@ class Moderation(commands.Cog):
     @PermissionHandler.has_permissions(kick_members=True)
     async def remove_warn(self, ctx, case_id: str):
         """Remove a warning by its case ID"""
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
-        mod_logs = settings.get('mod_logs', {})
+        await self.migrate_settings_warns(ctx.guild.id)
+        warning = self.cases.get(ctx.guild.id, case_id)
         
-        if case_id not in mod_logs or mod_logs[case_id].get('action') != 'Warn':
+        if not warning or warning.get('action') != 'Warn' or warning.get('removed'):
             return await ctx.send("Warning not found.")
             
-        warning = mod_logs[case_id]
-        del mod_logs[case_id]
-        
-        self.bot.settings.set_server_setting(ctx.guild.id, 'mod_logs', mod_logs)
+        await self.cases.remove(ctx.guild.id, [case_id], ctx.author.id)
         await ctx.send(f"Removed warning case **{case_id}**")
         
         member = ctx.guild.get_member(warning.get('user_id'))
@@ -1085,23 +1028,28 @@ class Moderation(commands.Cog):
     @PermissionHandler.has_permissions(kick_members=True)
     async def clear_warns(self, ctx, member: discord.Member):
         """Clear all warnings from a member"""
-        settings = self.bot.settings.get_all_server_settings(ctx.guild.id)
-        mod_logs = settings.get('mod_logs', {})
-        
-        removed = 0
-        new_logs = {}
-        for case_id, log in mod_logs.items():
-            if log.get('action') == 'Warn' and log.get('user_id') == member.id:
-                removed += 1
-            else:
-                new_logs[case_id] = log
+        await self.migrate_settings_warns(ctx.guild.id)
+        warnings = self.cases.for_user_action(ctx.guild.id, member.id, 'Warn')
                 
-        if removed == 0:
+        if not warnings:
             return await ctx.send(f"**{member.name}** has no warnings to clear.")
             
-        self.bot.settings.set_server_setting(ctx.guild.id, 'mod_logs', new_logs)
-        await ctx.send(f"Cleared {removed} warning(s) from **{member.name}**")
-        await self.log_mod_action(ctx, "Warnings Cleared", member, self.generate_case_id())
+        removed = await self.cases.remove(ctx.guild.id, [warn['case_id'] for warn in warnings], ctx.author.id)
+        await ctx.send(f"Cleared {len(removed)} warning(s) from **{member.name}**")
+        await self.log_mod_action(ctx, "Warnings Cleared", member, ', '.join(warn['case_id'] for warn in removed))
+
+    async def migrate_settings_warns(self, guild_id: int):
+        """Move warnings left in the old settings['mod_logs'] into the case store"""
+        mod_logs = self.bot.settings.get_server_view(guild_id).get('mod_logs')
+        if mod_logs is None:
+            return
+
+        await self.cases.add_many(guild_id, [
+            {**log, 'case_id': case_id}
+            for case_id, log in mod_logs.items()
+            if log.get('action') == 'Warn' and log.get('user_id') is not None
+        ])
+        self.bot.settings.remove_server_setting(guild_id, 'mod_logs')
 
     async def log_mod_action(self, ctx, action: str, target: Union[discord.Member, discord.User], case_id: str, *, reason: str = None, duration: str = None, expires_at: int = None):
         """Log a moderation action to the audit log channel"""
@@ -1130,5 +1078,145 @@ class Moderation(commands.Cog):
         embed.color = 0x2B2D31
         await channel.send(embed=embed)
 
+    async def log_mass_action(self, ctx, action: str, targets: list, case_ids: list, *, reason: str = None):
+        """Log one audit embed for an action applied to many users"""
+        if not targets:
+            return
+
+        log_channel_id = self.bot.settings.get_server_setting(ctx.guild.id, "log_channel_mod_audit")
+        if not log_channel_id:
+            return
+            
+        channel = ctx.guild.get_channel(int(log_channel_id))
+        if not channel:
+            return
+
+        lines, length = [], 0
+        for target, case_id in zip(targets, case_ids):
+            line = f"{target.mention} `{target.id}` - `{case_id}`"
+            if length + len(line) > 3000:
+                lines.append(f"...and {len(targets) - len(lines)} more")
+                break
+            lines.append(line)
+            length += len(line) + 1
+        shown = "\n".join(lines)
+
+        embed = EmbedBuilder(
+            title=f"{action} ({len(targets)} users)",
+            description=(
+                f"**Moderator:** {ctx.author.mention}\n`{ctx.author.id}`\n\n"
+                f"{shown}"
+                + (f"\n\n**Reason:**\n> {reason}" if reason else "\n\n**Reason:** No reason provided")
+            )
+        ).build()
+        embed.color = 0x2B2D31
+        await channel.send(embed=embed)
+
+    async def log_tempban_expiry(self, guild: discord.Guild, cases: list):
+        """Log one audit embed for tempbans lifted together"""
+        log_channel_id = self.bot.settings.get_server_setting(guild.id, "log_channel_mod_audit")
+        if not log_channel_id:
+            return
+            
+        channel = guild.get_channel(int(log_channel_id))
+        if not channel:
+            return
+
+        lines = [f"<@{case['user_id']}> `{case['user_id']}` - `{case['case_id']}`" for case in cases[:50]]
+        if len(cases) > 50:
+            lines.append(f"...and {len(cases) - 50} more")
+
+        embed = EmbedBuilder(
+            title="Tempban expired" + (f" ({len(cases)} users)" if len(cases) > 1 else ""),
+            description="\n".join(lines)
+        ).build()
+        embed.color = 0x2B2D31
+        await channel.send(embed=embed)
+
+    class RecordsView(discord.ui.View):
+        """Pages through a user's cases newest first, each page is built the first time it is opened"""
+        PER_PAGE = 10
+
+        def __init__(self, author, cases, guild, user):
+            super().__init__(timeout=300)
+            self.author = author
+            self.cases = cases
+            self.guild = guild
+            self.user = user
+            self.total = cases.count_for_user(guild.id, user.id)
+            self.pages = max(1, -(-self.total // self.PER_PAGE))
+            self.page = 0
+            self.message = None
+            self._embeds = {}
+            self.update_buttons()
+
+        def build(self, page):
+            """Embed for one page, only that page's cases are read from the index"""
+            embed = self._embeds.get(page)
+            if embed is not None:
+                return embed
+
+            records = self.cases.page_for_user(self.guild.id, self.user.id, page * self.PER_PAGE, self.PER_PAGE)
+            moderators = {mod_id: self.guild.get_member(mod_id) for mod_id in {record['mod_id'] for record in records}}
+
+            embed = discord.Embed(
+                title=f"Member records | Page {page + 1}/{self.pages}",
+                color=0x2B2D31,
+                timestamp=datetime.utcnow()
+            )
+            embed.description = f"**{self.user.name}**\nMention: {self.user.mention}\n```javascript\nID: {self.user.id}```\n**Total records:** {self.total}"
+            embed.set_thumbnail(url=self.user.display_avatar.url)
+
+            for record in records:
+                action_time = datetime.fromisoformat(record['timestamp'])
+                moderator = moderators[record['mod_id']]
+
+                embed.add_field(
+                    name=f"**{record['action']}**" + (" (removed)" if record.get('removed') else ""),
+                    value=(
+                        f"**Case ID:** `{record['case_id']}`\n"
+                        f"**Moderator:** {moderator.mention if moderator else 'Unknown moderator'}\n"
+                        f"When: {discord.utils.format_dt(action_time)}\n"
+                        f"> **Reason:**\n> {record['reason'] or 'No reason provided'}"
+                        + (f"\n> **Duration:** {record['duration']}" if 'duration' in record else "")
+                    ),
+                    inline=False
+                )
+
+            first = page * self.PER_PAGE + 1
+            embed.set_footer(text=f"Records {first}-{first + len(records) - 1} of {self.total}, newest first")
+            self._embeds[page] = embed
+            return embed
+
+        def update_buttons(self):
+            self.previous_page.disabled = self.page == 0
+            self.next_page.disabled = self.page >= self.pages - 1
+
+        async def interaction_check(self, interaction):
+            if interaction.user != self.author:
+                await interaction.response.send_message("This is not for you!", ephemeral=True)
+                return False
+            return True
+
+        async def show(self, interaction, page):
+            self.page = page
+            self.update_buttons()
+            await interaction.response.edit_message(embed=self.build(page), view=self)
+
+        @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+        async def previous_page(self, interaction, button):
+            await self.show(interaction, self.page - 1)
+
+        @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+        async def next_page(self, interaction, button):
+            await self.show(interaction, self.page + 1)
+
+        async def on_timeout(self):
+            if self.message is not None:
+                try:
+                    await self.message.edit(view=None)
+                except discord.HTTPException:
+                    pass
+
 async def setup(bot):
     await bot.add_cog(Moderation(bot))
\ No newline at end of file
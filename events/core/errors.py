@@ -7,32 +7,6 @@ class ErrorEvents(commands.Cog):
 
     @commands.Cog.listener()
     async def on_command_error(self, ctx, error):
-        if isinstance(error, commands.CommandNotFound):
-            prefixes = await self.bot.get_prefix(ctx.message)
-            content = ctx.message.content
-            
-            used_prefix = None
-            for prefix in prefixes:
-                if content.startswith(prefix):
-                    used_prefix = prefix
-                    break
-                
-            if not used_prefix:
-                return
-            
-            while content.startswith(used_prefix):
-                content = content[len(used_prefix):]
-            
-            if not content or content.isspace():
-                return
-            
-            expressions = ['?', '!', '.', '...', '????', '!!!!', '....']
-            if content.strip() in expressions or all(c in '?!.' for c in content.strip()):
-                return
-            
-            await ctx.send(f"**Unknown command**.\nUse `{ctx.prefix}help` for a list of commands.")
-            return
-
         if isinstance(error, commands.MissingPermissions):
             await ctx.send("You can't do that.")
             return
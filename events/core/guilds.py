@@ -0,0 +1,47 @@
+from discord.ext import commands
+
+class GuildEvents(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # Metadata last confirmed in settings, so reconnects skip guilds that haven't changed
+        self.synced = {}
+
+    def guild_metadata(self, guild) -> dict:
+        """Every guild-derived field we keep in the server settings"""
+        return {
+            'server_name': guild.name,
+            'server_icon': guild.icon.url if guild.icon else None,
+        }
+
+    def sync_guild(self, guild) -> None:
+        """Write guild metadata to settings, only touching fields that changed"""
+        metadata = self.guild_metadata(guild)
+        if self.synced.get(guild.id) == metadata:
+            return
+
+        settings = self.bot.settings
+        for setting, value in metadata.items():
+            # peek keeps the READY sweep from loading every guild into the settings cache
+            if settings.peek_server_setting(guild.id, setting) != value:
+                settings.set_server_setting(guild.id, setting, value)
+        self.synced[guild.id] = metadata
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        for guild in self.bot.guilds:
+            self.sync_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.synced.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.sync_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        self.sync_guild(after)
+
+async def setup(bot):
+    await bot.add_cog(GuildEvents(bot))
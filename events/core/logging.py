@@ -2,23 +2,27 @@ import discord
 from discord.ext import commands
 from datetime import datetime
 from utils.helpers.formatting import EmbedBuilder
+from utils.helpers.batching import EmbedBatcher
+from utils.settings.defaults import DEFAULT_SETTINGS
 
 class LoggingEvents(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.recent_deletions = {}
+        self.batcher = EmbedBatcher()
+
+    async def cog_unload(self):
+        await self.batcher.drain()
 
     async def log_to_channel(self, guild_id: int, log_type: str, embed: discord.Embed):
-        """Logs to the appropriate channel"""
+        """Queues a log embed for the appropriate channel, bursts are sent as one message"""
         try:
-            setting_name = f"log_channel_{log_type}"
-            settings = self.bot.settings.get_all_server_settings(guild_id)
-            channel_id = settings.get(setting_name)
-            
+            config = self.bot.settings.get_guild_config(guild_id)
+            channel_id = config.log_channel(log_type)
             if not channel_id:
                 return
                 
-            channel = self.bot.get_channel(int(channel_id))
+            channel = self.bot.get_channel(channel_id)
             if not channel:
                 return
                 
@@ -26,7 +30,10 @@ class LoggingEvents(commands.Cog):
             if not permissions.send_messages or not permissions.embed_links:
                 return
 
-            await channel.send(embed=embed)
+            window = config.log_batch_window
+            if window is None:
+                window = DEFAULT_SETTINGS['log_batch_window']
+            self.batcher.add(channel, embed, window)
             
         except Exception as e:
             print(f"Error in log_to_channel: {str(e)}")
@@ -14,13 +14,6 @@ class MessageEvents(commands.Cog):
         if message.author == self.bot.user:
             return
 
-        if message.guild:
-            self.bot.settings.set_server_setting(
-                message.guild.id, 
-                "server_name", 
-                message.guild.name
-            )
-
         if self.bot.user.mentioned_in(message) and not any(
             m in message.content for m in ['@everyone', '@here']
         ):
@@ -18,32 +18,34 @@ class StarboardEvents(commands.Cog):
     async def handle_starboard(self, payload):
         if payload.member and payload.member.bot:
             return
+
+        if not payload.guild_id:
+            return
+
+        valid_emojis = ['⭐', '🌟', '✨', '🔥']
+        
+        if str(payload.emoji) not in valid_emojis:
+            return
+
+        config = self.bot.settings.get_guild_config(payload.guild_id)
+        threshold = config.starboard_threshold or 3
+        
+        if not config.starboard_channel:
+            return
             
         channel = self.bot.get_channel(payload.channel_id)
         if not channel:
             return
             
+        starboard_channel = channel.guild.get_channel(config.starboard_channel)
+        if not starboard_channel:
+            return
+
         try:
             message = await channel.fetch_message(payload.message_id)
         except discord.NotFound:
             return
             
-        settings = self.bot.settings.get_all_server_settings(payload.guild_id)
-        starboard_channel_id = settings.get('starboard_channel')
-        threshold = settings.get('starboard_threshold', 3)
-        
-        if not starboard_channel_id:
-            return
-            
-        starboard_channel = channel.guild.get_channel(int(starboard_channel_id))
-        if not starboard_channel:
-            return
-            
-        valid_emojis = ['⭐', '🌟', '✨', '🔥']
-        
-        if str(payload.emoji) not in valid_emojis:
-            return
-            
         star_count = 0
         active_emoji = None
         for emoji in valid_emojis:
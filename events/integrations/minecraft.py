@@ -43,11 +43,12 @@ class Minecraft(commands.Cog):
             return
 
         for guild in self.bot.guilds:
-            settings = self.bot.settings.get_all_server_settings(guild.id)
-            if not settings.get('minecraft', {}).get('notifications_channel'):
+            # peek, so a sweep over every guild doesn't count as using their settings
+            minecraft = self.bot.settings.peek_server_setting(guild.id, 'minecraft') or {}
+            if not minecraft.get('notifications_channel'):
                 continue
 
-            channel_id = settings['minecraft']['notifications_channel']
+            channel_id = minecraft['notifications_channel']
             channel = guild.get_channel(int(channel_id))
             if not channel:
                 continue
@@ -83,8 +84,8 @@ class Minecraft(commands.Cog):
                 embed.set_footer(text="Release time")
                 
                 view = self.ReadMoreButton(latest_info['release'].replace('.', '-'))
-                if settings['minecraft'].get('ping_role'):
-                    await channel.send(f"<@&{settings['minecraft']['ping_role']}>", embed=embed, view=view)
+                if minecraft.get('ping_role'):
+                    await channel.send(f"<@&{minecraft['ping_role']}>", embed=embed, view=view)
                 else:
                     await channel.send(embed=embed, view=view)
                 
@@ -118,8 +119,8 @@ class Minecraft(commands.Cog):
                 embed.set_footer(text="Release time")
                 
                 view = self.ReadMoreButton(latest_info['snapshot'], is_snapshot=True)
-                if settings['minecraft'].get('ping_role'):
-                    await channel.send(f"<@&{settings['minecraft']['ping_role']}>", embed=embed, view=view)
+                if minecraft.get('ping_role'):
+                    await channel.send(f"<@&{minecraft['ping_role']}>", embed=embed, view=view)
                 else:
                     await channel.send(embed=embed, view=view)
                 
@@ -7,6 +7,7 @@ import asyncio
 from utils.helpers import PermissionHandler
 from datetime import datetime, timezone
 from config import TWITCH_CLIENT_ID, TWITCH_CLIENT_SECRET
+from utils.cache.memory import MemoryCache
 
 class Twitch(commands.Cog):
     def __init__(self, bot):
@@ -14,6 +15,7 @@ class Twitch(commands.Cog):
         self.twitch_client_id = TWITCH_CLIENT_ID
         self.twitch_client_secret = TWITCH_CLIENT_SECRET
         self.access_token = None
+        self.cache = MemoryCache(max_entries=2000, namespace='twitch', disk=bot.disk_cache)
         self.check_streams.start()
         self.stream_cooldowns = {}
         self.STREAM_COOLDOWN = 14400
@@ -37,45 +39,70 @@ class Twitch(commands.Cog):
         return None
 
     async def get_stream_info(self, username):
-        """Get stream information from Twitch API"""
+        """Get stream information, shared by every guild tracking the streamer for one poll"""
+        return await self.cache.get_or_load(
+            f"stream:{username.lower()}",
+            lambda: self.fetch_stream_info(username),
+            ttl=90,
+            negative_ttl=90
+        )
+
+    async def helix_get(self, path):
+        """GET a Helix endpoint, refreshing the access token once if it has expired"""
         if not self.access_token:
             await self.get_access_token()
 
-        headers = {
-            'Client-ID': self.twitch_client_id,
-            'Authorization': f'Bearer {self.access_token}'
-        }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f'https://api.twitch.tv/helix/streams?user_login={username}', headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-
-                    stream_data = data['data'][0] if data['data'] else None
-                    if not stream_data:
+        for _ in range(2):
+            headers = {
+                'Client-ID': self.twitch_client_id,
+                'Authorization': f'Bearer {self.access_token}'
+            }
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f'https://api.twitch.tv/helix/{path}', headers=headers) as resp:
+                    if resp.status == 200:
+                        return await resp.json()
+                    if resp.status != 401:
                         return None
-                    
-                    user_id = stream_data['user_id']
-                    async with session.get(f'https://api.twitch.tv/helix/users?id={user_id}', headers=headers) as user_resp:
-                        if user_resp.status == 200:
-                            user_data = await user_resp.json()
-                            if user_data['data']:
-                                stream_data['profile_image'] = user_data['data'][0]['profile_image_url']
-                                stream_data['display_name'] = user_data['data'][0]['display_name']
-
-                    if stream_data['game_id']:
-                        async with session.get(f'https://api.twitch.tv/helix/games?id={stream_data["game_id"]}', headers=headers) as game_resp:
-                            if game_resp.status == 200:
-                                game_data = await game_resp.json()
-                                if game_data['data']:
-                                    stream_data['game_box_art'] = game_data['data'][0]['box_art_url'].replace('{width}', '188').replace('{height}', '250')
-
-                    return stream_data
-                elif resp.status == 401:
-                    await self.get_access_token()
-                    return await self.get_stream_info(username)
+            await self.get_access_token()
         return None
 
+    async def get_user(self, user_id):
+        """Profile data rarely changes, keep it for a day"""
+        async def load():
+            data = await self.helix_get(f'users?id={user_id}')
+            return data['data'][0] if data and data['data'] else None
+
+        return await self.cache.get_or_load(f"user:{user_id}", load, ttl=86400)
+
+    async def get_game_box_art(self, game_id):
+        """Box art URLs are stable, keep them for a week"""
+        async def load():
+            data = await self.helix_get(f'games?id={game_id}')
+            if data and data['data']:
+                return data['data'][0]['box_art_url'].replace('{width}', '188').replace('{height}', '250')
+            return None
+
+        return await self.cache.get_or_load(f"game:{game_id}", load, ttl=604800)
+
+    async def fetch_stream_info(self, username):
+        """Get stream information from Twitch API"""
+        data = await self.helix_get(f'streams?user_login={username}')
+        if not data or not data['data']:
+            return None
+
+        stream_data = data['data'][0]
+        user = await self.get_user(stream_data['user_id'])
+        if user:
+            stream_data['profile_image'] = user['profile_image_url']
+            stream_data['display_name'] = user['display_name']
+
+        if stream_data['game_id']:
+            box_art = await self.get_game_box_art(stream_data['game_id'])
+            if box_art:
+                stream_data['game_box_art'] = box_art
+
+        return stream_data
+
     #################################
     ## Check Streams
     #################################
@@ -85,11 +112,12 @@ class Twitch(commands.Cog):
         current_time = datetime.now(timezone.utc)
 
         for guild in self.bot.guilds:
-            settings = self.bot.settings.get_all_server_settings(guild.id)
-            if not settings.get('twitch', {}).get('streamers'):
+            # peek, so a sweep over every guild doesn't count as using their settings
+            twitch = self.bot.settings.peek_server_setting(guild.id, 'twitch') or {}
+            if not twitch.get('streamers'):
                 continue
 
-            for streamer, streamer_data in settings['twitch']['streamers'].items():
+            for streamer, streamer_data in twitch['streamers'].items():
                 try:
                     stream_info = await self.get_stream_info(streamer)
                     message_key = f"{guild.id}-{streamer}"
@@ -133,8 +161,8 @@ class Twitch(commands.Cog):
                             for role_id in streamer_data.get('ping_roles', []):
                                 mentions.append(f"<@&{role_id}>")
                             
-                            if settings['twitch'].get('ping_role'):
-                                mentions.append(f"<@&{settings['twitch']['ping_role']}>")
+                            if twitch.get('ping_role'):
+                                mentions.append(f"<@&{twitch['ping_role']}>")
 
                             if mentions:
                                 message = f"{' '.join(mentions)} {message}"
@@ -142,9 +170,9 @@ class Twitch(commands.Cog):
                             view = self.WatchStreamButton(stream_url)
                             sent_message = await channel.send(message, embed=embed, view=view)
                             
-                            settings['twitch']['last_notifications'][message_key] = stream_start.isoformat()
-                            settings['twitch']['notification_messages'][message_key] = sent_message.id
-                            self.bot.settings.set_server_setting(guild.id, 'twitch', settings['twitch'])
+                            twitch['last_notifications'][message_key] = stream_start.isoformat()
+                            twitch['notification_messages'][message_key] = sent_message.id
+                            self.bot.settings.set_server_setting(guild.id, 'twitch', twitch)
 
                             self.stream_cooldowns[cooldown_key] = current_time
 
@@ -165,16 +193,16 @@ class Twitch(commands.Cog):
                                 view = self.WatchStreamButton(stream_url)
                                 await message.edit(content=new_content, embed=embed, view=view)
                                 
-                                settings['twitch']['last_notifications'].pop(message_key, None)
-                                settings['twitch']['notification_messages'].pop(message_key, None)
-                                self.bot.settings.set_server_setting(guild.id, 'twitch', settings['twitch'])
+                                twitch['last_notifications'].pop(message_key, None)
+                                twitch['notification_messages'].pop(message_key, None)
+                                self.bot.settings.set_server_setting(guild.id, 'twitch', twitch)
                                 
                                 self.stream_cooldowns.pop(cooldown_key, None)
 
                         except (discord.NotFound, discord.HTTPException):
                             notification_messages.pop(message_key, None)
                             last_notifications.pop(message_key, None)
-                            self.bot.settings.set_server_setting(guild.id, 'twitch', settings['twitch'])
+                            self.bot.settings.set_server_setting(guild.id, 'twitch', twitch)
 
                 except Exception as e:
                     print(f"Error checking stream {streamer}: {e}")
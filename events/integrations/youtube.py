@@ -7,18 +7,32 @@ import asyncio
 from utils.helpers import PermissionHandler
 from datetime import datetime, timezone
 from config import YOUTUBE_API_KEY
+from utils.cache.memory import MemoryCache
 
 class YouTube(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.youtube_api_key = YOUTUBE_API_KEY
+        self.cache = MemoryCache(max_entries=2000, namespace='youtube', disk=bot.disk_cache)
         self.check_channels.start()
 
     def cog_unload(self):
         self.check_channels.cancel()
 
     async def get_channel_info(self, channel_id):
-        """Get channel information from YouTube API"""
+        """Channel details only change on rebrands, keep them for a day"""
+        return await self.cache.get_or_load(
+            f"channel:{channel_id}",
+            lambda: self.fetch_channel_info(channel_id),
+            ttl=86400,
+            negative_ttl=3600
+        )
+
+    async def fetch_channel_info(self, channel_id):
+        """
+        Get channel information from YouTube API
+        Only a missing channel returns None; quota and server errors raise so they aren't cached as one
+        """
         async with aiohttp.ClientSession() as session:
             url = f"https://www.googleapis.com/youtube/v3/channels"
             params = {
@@ -28,10 +42,11 @@ class YouTube(commands.Cog):
             }
             
             async with session.get(url, params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data['items'][0] if data['items'] else None
-        return None
+                if resp.status == 404:
+                    return None
+                resp.raise_for_status()
+                data = await resp.json()
+                return data['items'][0] if data.get('items') else None
 
     async def get_latest_content(self, playlist_id):
         """Get latest videos/streams from a channel's upload playlist"""
@@ -58,6 +73,18 @@ class YouTube(commands.Cog):
                 return None
 
     async def get_channel_id_from_url(self, identifier):
+        """Resolve a channel ID, caching handle lookups since search costs 100 quota units"""
+        if identifier.startswith('UC'):
+            return identifier
+
+        return await self.cache.get_or_load(
+            f"handle:{identifier.lower()}",
+            lambda: self.fetch_channel_id_from_url(identifier),
+            ttl=604800,
+            negative_ttl=3600
+        )
+
+    async def fetch_channel_id_from_url(self, identifier):
         """Extract or fetch channel ID from various YouTube URL formats or username"""
         if identifier.startswith('UC'):
             return identifier
@@ -83,10 +110,10 @@ class YouTube(commands.Cog):
             }
             
             async with session.get(url, params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if data.get('items'):
-                        return data['items'][0]['id']
+                resp.raise_for_status()
+                data = await resp.json()
+                if data.get('items'):
+                    return data['items'][0]['id']
 
             url = "https://www.googleapis.com/youtube/v3/search"
             params = {
@@ -98,12 +125,11 @@ class YouTube(commands.Cog):
             }
             
             async with session.get(url, params=params) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if data.get('items'):
-                        for item in data['items']:
-                            if item['snippet']['title'].lower() == username.lower():
-                                return item['id']['channelId']
+                resp.raise_for_status()
+                data = await resp.json()
+                for item in data.get('items', []):
+                    if item['snippet']['title'].lower() == username.lower():
+                        return item['id']['channelId']
         return None
 
     class WatchVideoButton(discord.ui.View):
@@ -119,11 +145,12 @@ class YouTube(commands.Cog):
     async def check_channels(self):
         """Check for new YouTube uploads"""
         for guild in self.bot.guilds:
-            settings = self.bot.settings.get_all_server_settings(guild.id)
-            if not settings.get('youtube', {}).get('channels'):
+            # peek, so a sweep over every guild doesn't count as using their settings
+            youtube = self.bot.settings.peek_server_setting(guild.id, 'youtube') or {}
+            if not youtube.get('channels'):
                 continue
 
-            channel_id = settings['youtube'].get('notifications_channel')
+            channel_id = youtube.get('notifications_channel')
             if not channel_id:
                 continue
 
@@ -131,7 +158,7 @@ class YouTube(commands.Cog):
             if not discord_channel:
                 continue
 
-            for yt_channel_id, channel_data in settings['youtube']['channels'].items():
+            for yt_channel_id, channel_data in youtube['channels'].items():
                 try:
                     channel_info = await self.get_channel_info(yt_channel_id)
                     if not channel_info:
@@ -144,7 +171,7 @@ class YouTube(commands.Cog):
                         continue
 
                     video_id = latest_video['contentDetails']['videoId']
-                    last_video_id = settings['youtube'].setdefault('last_videos', {}).get(yt_channel_id)
+                    last_video_id = youtube.setdefault('last_videos', {}).get(yt_channel_id)
 
                     if video_id != last_video_id:
                         video_url = f"https://youtube.com/watch?v={video_id}"
@@ -173,8 +200,8 @@ class YouTube(commands.Cog):
                             for role_id in channel_data['ping_roles']:
                                 mentions.append(f"<@&{role_id}>")
 
-                        if settings['youtube'].get('ping_role'):
-                            mentions.append(f"<@&{settings['youtube']['ping_role']}>")
+                        if youtube.get('ping_role'):
+                            mentions.append(f"<@&{youtube['ping_role']}>")
 
                         message = f"**{channel_name}** uploaded a new video!"
                         if mentions:
@@ -183,8 +210,8 @@ class YouTube(commands.Cog):
                         view = self.WatchVideoButton(video_url)
                         await discord_channel.send(message, embed=embed, view=view)
 
-                        settings['youtube']['last_videos'][yt_channel_id] = video_id
-                        self.bot.settings.set_server_setting(guild.id, 'youtube', settings['youtube'])
+                        youtube['last_videos'][yt_channel_id] = video_id
+                        self.bot.settings.set_server_setting(guild.id, 'youtube', youtube)
 
                 except Exception as e:
                     print(f"Error checking YouTube channel {yt_channel_id}: {e}")
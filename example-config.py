@@ -10,3 +10,6 @@ TWITCH_CLIENT_SECRET = 'and its token'
 
 YOUTUBE_API_KEY = 'youtube api v3 key'
 # go to https://console.cloud.google.com/apis/api/youtube.googleapis.com
+
+SETTINGS_BACKEND = 'json'
+# 'json' or 'sqlite', run `python -m utils.settings.migrate` once before switching to sqlite
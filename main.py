@@ -3,7 +3,13 @@ import asyncio
 import random
 import json
 
+import config
 from utils.settings.handler import ServerSettings
+from utils.cache.disk import DiskCache
+from utils.cache.users import UserResolver
+from utils.moderation.cases import CaseStore
+from utils.dispatch.prefix import PrefixResolver
+from utils.dispatch.trie import CommandFilter
 from discord.ext import commands
 from config import TOKEN
 
@@ -11,20 +17,27 @@ from config import TOKEN
 class Bot(commands.Bot):
     def __init__(self):
         self.default_prefixes = ['$', '%', '?', '!', '.']
+        self.command_filter = CommandFilter(self)
         
         super().__init__(
             command_prefix=self.get_prefix,
             intents=discord.Intents.all(),
             help_command=None,
         )
-        self.settings = ServerSettings()
+        self.settings = ServerSettings(backend=getattr(config, 'SETTINGS_BACKEND', 'json'))
+        self.prefixes = PrefixResolver(self.settings, self.default_prefixes)
+        self.disk_cache = DiskCache()
+        self.cases = CaseStore()
+        self.user_resolver = UserResolver(self)
 
     #################################
     ## Setup Hook
     #################################   
     async def setup_hook(self):
+        self.settings.start()
+
         print("Loading core events...")
-        for event in ['logging', 'messages', 'errors']:
+        for event in ['logging', 'messages', 'errors', 'guilds']:
             try:
                 await self.load_extension(f"events.core.{event}")
                 print(f"Loaded events.core.{event}")
@@ -54,6 +67,19 @@ class Bot(commands.Bot):
             except Exception as e:
                 print(f"Failed to load {extension}: {e}")
 
+    #################################
+    ## Shutdown
+    #################################
+    async def close(self):
+        # Pending log batches need the HTTP session, send them before it closes
+        logging_cog = self.get_cog('LoggingEvents')
+        if logging_cog is not None:
+            await logging_cog.batcher.drain()
+        await super().close()
+        self.settings.close()
+        self.disk_cache.close()
+        self.cases.close()
+
     #################################
     ## Ready and Status
     #################################   
@@ -90,20 +116,34 @@ class Bot(commands.Bot):
     ## Get Prefix
     #################################
     async def get_prefix(self, message):
-        if not message.guild:
-            return self.default_prefixes
+        # Hand discord.py the one prefix that matched so it can skip it directly
+        matched = self.prefixes.match(message)
+        if matched:
+            return matched
 
-        settings = self.settings.get_all_server_settings(message.guild.id)
-        prefixes = []
-        
-        custom_prefix = settings.get('prefix')
-        if custom_prefix:
-            prefixes.append(custom_prefix)
-        
-        if settings.get('use_default_prefix', True):
-            prefixes.extend(self.default_prefixes)
-        
-        return prefixes if prefixes else self.default_prefixes
+        return list(self.prefixes.get(message.guild.id if message.guild else None))
+
+    #################################
+    ## Command Dispatch
+    #################################
+    def add_command(self, command):
+        super().add_command(command)
+        self.command_filter.invalidate()
+
+    def remove_command(self, name):
+        command = super().remove_command(name)
+        self.command_filter.invalidate()
+        return command
+
+    async def process_commands(self, message):
+        if message.author.bot:
+            return
+
+        if not self.command_filter.allows(message):
+            return
+
+        ctx = await self.get_context(message)
+        await self.invoke(ctx)
 
 def main():
     bot = Bot()
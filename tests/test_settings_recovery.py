@@ -0,0 +1,113 @@
+"""
+Crash recovery for the journaled JSON settings backend
+A child process writes settings and reports each write once it is journaled; it is SIGKILLed
+mid-run and the settings are reloaded to check nothing acknowledged was lost or truncated
+Run with: python -m unittest tests.test_settings_recovery
+"""
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Writes forever, compacting every `every` writes; a large padding makes each snapshot slow
+# enough that kills regularly land inside the compaction
+WRITER = """
+import sys
+sys.path.insert(0, {root!r})
+from utils.settings.backends import JSONBackend
+
+backend = JSONBackend({path!r})
+for i in range({guilds}):
+    backend.set(f"pad{{i}}", 'padding', 'x' * 2000)
+backend.flush()
+print('ready', flush=True)
+
+i = 0
+while True:
+    backend.set('guild', f"key{{i}}", i)
+    print(i, flush=True)
+    i += 1
+    if i % {every} == 0:
+        backend.flush()
+"""
+
+def run_and_kill(path: str, delay: float, every: int, guilds: int = 2000) -> int:
+    """Start a writer, SIGKILL it after delay seconds of writing, return the last acknowledged write"""
+    script = WRITER.format(root=ROOT, path=path, every=every, guilds=guilds)
+    proc = subprocess.Popen([sys.executable, '-c', script], stdout=subprocess.PIPE, text=True)
+    try:
+        assert proc.stdout.readline().strip() == 'ready'
+        time.sleep(delay)
+        os.kill(proc.pid, signal.SIGKILL)
+        proc.wait()
+        lines = proc.stdout.read().split()
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    return int(lines[-1]) if lines else -1
+
+class JSONBackendRecoveryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'settings.json')
+
+    def reload(self):
+        from utils.settings.backends import JSONBackend
+        return JSONBackend(self.path)
+
+    def assert_recovered(self, last: int) -> None:
+        backend = self.reload()
+        self.addCleanup(backend._journal.close)
+        guild = backend.load_guild('guild')
+        for i in range(last + 1):
+            self.assertEqual(guild.get(f"key{i}"), i, f"acknowledged write {i} was lost")
+        self.assertEqual(len(backend.settings) - 1, 2000, "padding guilds were lost")
+
+        # Recovery folds everything into a snapshot that parses on its own
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)['guild'], guild)
+        self.assertFalse(os.path.exists(backend.compacting_path))
+        self.assertFalse([name for name in os.listdir(self.tmp.name) if name.endswith('.tmp')])
+
+    def test_kill_mid_append(self):
+        # Compaction effectively never runs, so the kill lands among journal appends
+        last = run_and_kill(self.path, 0.3, every=10 ** 9)
+        self.assertGreaterEqual(last, 0)
+        self.assert_recovered(last)
+
+    def test_kill_mid_compaction(self):
+        # Repeated kills at random points of a write/compact cycle, each run resuming the last one's files
+        rng = random.Random(9)
+        for _ in range(8):
+            last = run_and_kill(self.path, rng.uniform(0.05, 0.4), every=5)
+            self.assertGreaterEqual(last, 0)
+            self.assert_recovered(last)
+
+    def test_torn_journal_tail(self):
+        # Each backend is abandoned without close(), like a killed process
+        backend = self.reload()
+        backend.set('guild', 'kept', 1)
+        backend._journal.close()
+        with open(backend.journal_path, 'a') as f:
+            f.write('{"op": "set", "guild": "guild", "ke')
+
+        backend = self.reload()
+        backend.set('guild', 'after', 2)
+        backend._journal.close()
+
+        backend = self.reload()
+        self.addCleanup(backend.close)
+        self.assertEqual(backend.load_guild('guild'), {'kept': 1, 'after': 2})
+
+if __name__ == '__main__':
+    unittest.main()
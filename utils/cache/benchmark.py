@@ -0,0 +1,66 @@
+"""
+Measure MemoryCache memory use and get/set throughput
+Usage: python -m utils.cache.benchmark [--keys 1000000] [--compare path/to/other/memory.py]
+"""
+import argparse
+import gc
+import importlib.util
+import time
+import tracemalloc
+from .memory import MemoryCache
+
+def load_cache_class(path: str):
+    spec = importlib.util.spec_from_file_location('compare_memory', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.MemoryCache
+
+def fill(cache_class, names):
+    cache = cache_class()
+    for i, key in enumerate(names):
+        cache.set(key, i, ttl=3600 if i % 2 else None)
+    return cache
+
+def run(name: str, cache_class, keys: int) -> None:
+    names = [f"user:{i}" for i in range(keys)]
+    gc.collect()
+
+    tracemalloc.start()
+    cache = fill(cache_class, names)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del cache
+    gc.collect()
+
+    start = time.perf_counter()
+    cache = fill(cache_class, names)
+    set_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in names:
+        cache.get(key)
+    get_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cache.cleanup()
+    cleanup_time = time.perf_counter() - start
+
+    print(
+        f"{name:>8}: {memory / 1024 / 1024:7.1f} MiB | "
+        f"set {keys / set_time / 1000:7.0f}k/s | "
+        f"get {keys / get_time / 1000:7.0f}k/s | "
+        f"cleanup {cleanup_time * 1000:7.1f}ms"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MemoryCache")
+    parser.add_argument('--keys', type=int, default=1000000)
+    parser.add_argument('--compare', help="Path to another memory.py to benchmark alongside")
+    args = parser.parse_args()
+
+    if args.compare:
+        run('compare', load_cache_class(args.compare), args.keys)
+    run('current', MemoryCache, args.keys)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import json
+import sqlite3
+import time
+from typing import Any, Optional, Tuple
+
+class DiskCache:
+    """
+    SQLite-backed cache tier that survives restarts
+    Values must be JSON serialisable; the least recently read rows are dropped once max_bytes is exceeded
+    """
+
+    def __init__(self, path: str = 'data/cache.db', max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL, "
+            "size INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires_at)")
+
+        self.cleanup()
+        self._bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes of serialised values currently stored"""
+        return self._bytes
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Get (value, expires_at) for a key that hasn't expired yet"""
+        row = self.db.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if row[1] <= now:
+            self.delete(key)
+            return None
+
+        self.db.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds"""
+        payload = json.dumps(value)
+        now = time.time()
+
+        with self.db:
+            self.db.execute("BEGIN")
+            old = self.db.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+            self.db.execute(
+                "INSERT INTO cache (key, value, expires_at, accessed_at, size) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at, "
+                "accessed_at = excluded.accessed_at, size = excluded.size",
+                (key, payload, now + ttl, now, len(payload))
+            )
+        self._bytes += len(payload) - (old[0] if old else 0)
+
+        if self._bytes > self.max_bytes:
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        """Delete a value"""
+        with self.db:
+            self.db.execute("BEGIN")
+            row = self.db.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+            self.db.execute("DELETE FROM cache WHERE key = ?", (key,))
+        if row is not None:
+            self._bytes -= row[0]
+
+    def cleanup(self) -> None:
+        """Remove all expired rows"""
+        self.db.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        self._bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+    def _evict(self) -> None:
+        """Drop expired rows, then least recently read ones until under a tenth below the cap"""
+        self.cleanup()
+        target = self.max_bytes * 0.9
+        with self.db:
+            self.db.execute("BEGIN")
+            for key, size in self.db.execute("SELECT key, size FROM cache ORDER BY accessed_at").fetchall():
+                if self._bytes <= target:
+                    break
+                self.db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._bytes -= size
+
+    def close(self) -> None:
+        self.db.close()
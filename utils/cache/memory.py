@@ -1,51 +1,308 @@
-from typing import Any, Dict, Optional
-from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import heapq
+import sys
 import time
+import weakref
+from .disk import DiskCache
 
 class CacheEntry:
-    def __init__(self, value: Any, ttl: Optional[int] = None):
+    __slots__ = ('value', 'expires_at', 'stale_until', 'size')
+
+    def __init__(self, value: Any, ttl: Optional[int] = None, size: int = 0, stale_ttl: Optional[int] = None):
         self.value = value
         self.expires_at = time.time() + ttl if ttl else None
+        self.stale_until = self.expires_at + stale_ttl if self.expires_at and stale_ttl else None
+        self.size = size
 
     def is_expired(self) -> bool:
         if self.expires_at is None:
             return False
         return time.time() > self.expires_at
 
-class MemoryCache:
+    @property
+    def removal_at(self) -> Optional[float]:
+        """When the entry stops being servable at all, stale or not"""
+        return self.stale_until or self.expires_at
+
+def estimate_size(key: str, value: Any) -> int:
+    """Approximate memory held by an entry, one container level deep"""
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(v) for v in value)
+    return size
+
+class CacheStats:
+    """Counters shared by every cache in a namespace"""
+    __slots__ = ('hits', 'stale_hits', 'misses', 'coalesced', 'disk_hits', 'evictions', 'expirations', 'loads', 'load_errors', 'load_time', 'max_load_time')
+
     def __init__(self):
-        self._cache: Dict[str, CacheEntry] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        lookups = self.hits + self.stale_hits + self.misses
+        data['hit_rate'] = (self.hits + self.stale_hits) / lookups if lookups else 0.0
+        data['disk_hit_rate'] = self.disk_hits / self.misses if self.misses else 0.0
+        data['avg_load_time'] = self.load_time / self.loads if self.loads else 0.0
+        return data
+
+_stats: Dict[str, CacheStats] = {}
+_instances: "weakref.WeakSet[MemoryCache]" = weakref.WeakSet()
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters plus current size for every namespace"""
+    result = {namespace: stats.to_dict() for namespace, stats in _stats.items()}
+    for data in result.values():
+        data['entries'] = data['bytes'] = 0
+    for cache in list(_instances):
+        data = result[cache.namespace]
+        data['entries'] += len(cache)
+        data['bytes'] += cache.size_bytes
+    return result
+
+def reset_cache_stats() -> None:
+    """Zero the counters of every namespace"""
+    for stats in _stats.values():
+        stats.reset()
+
+class MemoryCache:
+    """
+    LRU cache with optional bounds on entry count and approximate bytes
+    TTL expiry is tracked in one-second buckets ordered by a min-heap,
+    so cleanup only touches entries that are actually due
+    With a DiskCache attached, get_or_load checks disk before calling the loader
+    and writes loaded values through to it
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        namespace: str = 'default',
+        disk: Optional[DiskCache] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.disk = disk
+        self.stats = _stats.get(namespace) or _stats.setdefault(namespace, CacheStats())
+        _instances.add(self)
+
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._buckets: Dict[int, List[str]] = {}
+        self._bucket_heap: List[int] = []
+        self._scheduled = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._bounded = max_entries is not None or max_bytes is not None
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate bytes held, only tracked when max_bytes is set"""
+        return self._bytes
 
     def get(self, key: str) -> Optional[Any]:
         """Get a value from cache"""
         entry = self._cache.get(key)
         if entry is None:
+            self.stats.misses += 1
             return None
-            
-        if entry.is_expired():
-            del self._cache[key]
+
+        if entry.expires_at is not None and time.time() > entry.expires_at:
+            self.stats.misses += 1
+            if entry.stale_until is None or time.time() > entry.stale_until:
+                self._remove(key)
+                self.stats.expirations += 1
             return None
-            
+
+        self.stats.hits += 1
+        self._cache.move_to_end(key)
         return entry.value
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Set a value in cache with optional TTL in seconds"""
-        self._cache[key] = CacheEntry(value, ttl)
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, stale_ttl: Optional[int] = None) -> None:
+        """
+        Set a value in cache with optional TTL in seconds
+        stale_ttl keeps the value around that much longer for get_or_load to serve while refreshing
+        """
+        size = estimate_size(key, value) if self.max_bytes is not None else 0
+        entry = CacheEntry(value, ttl, size, stale_ttl)
+
+        old = self._cache.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._cache[key] = entry
+        self._bytes += size
+
+        if entry.expires_at is not None:
+            self._schedule(key, entry.removal_at)
+
+        if self._bucket_heap and self._bucket_heap[0] <= time.time():
+            self._expire(time.time())
+        if self._bounded:
+            self._evict()
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+        negative_ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Get a value, calling loader() on a miss
+        Concurrent misses for the same key share one loader call. Within stale_ttl
+        after expiry the old value is returned while a background refresh runs.
+        None results are only cached when negative_ttl is given.
+        """
+        entry = self._cache.get(key)
+        if entry is not None:
+            now = time.time()
+            if entry.expires_at is None or now <= entry.expires_at:
+                self.stats.hits += 1
+                self._cache.move_to_end(key)
+                return entry.value
+
+            if entry.stale_until is not None and now <= entry.stale_until:
+                self.stats.stale_hits += 1
+                self._cache.move_to_end(key)
+                if key not in self._inflight:
+                    self._start_load(key, loader, ttl, stale_ttl, negative_ttl)
+                return entry.value
+
+        self.stats.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_load(key, loader, ttl, stale_ttl, negative_ttl)
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _start_load(self, key, loader, ttl, stale_ttl, negative_ttl) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._load(key, loader, ttl, stale_ttl, negative_ttl))
+        # Background refreshes have no awaiter, retrieve their errors so they aren't reported as lost
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return task
+
+    async def _load(self, key, loader, ttl, stale_ttl, negative_ttl) -> Any:
+        stats = self.stats
+        if self.disk is not None:
+            hit = self._disk_get(key)
+            if hit is not None:
+                value, expires_at = hit
+                stats.disk_hits += 1
+                self.set(key, value, expires_at - time.time(), stale_ttl)
+                self._inflight.pop(key, None)
+                return value
+
+        started = time.perf_counter()
+        try:
+            value = await loader()
+        except Exception:
+            stats.load_errors += 1
+            raise
+        else:
+            if value is not None:
+                self.set(key, value, ttl, stale_ttl)
+            elif negative_ttl:
+                self.set(key, None, negative_ttl)
+
+            disk_ttl = ttl if value is not None else negative_ttl
+            if self.disk is not None and disk_ttl:
+                self._disk_set(key, value, disk_ttl)
+            return value
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.loads += 1
+            stats.load_time += elapsed
+            stats.max_load_time = max(stats.max_load_time, elapsed)
+            self._inflight.pop(key, None)
+
+    def _disk_get(self, key: str) -> Optional[Tuple[Any, float]]:
+        try:
+            return self.disk.get(f"{self.namespace}:{key}")
+        except Exception as e:
+            print(f"Error reading {self.namespace} disk cache: {e}")
+            return None
+
+    def _disk_set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self.disk.set(f"{self.namespace}:{key}", value, ttl)
+        except Exception as e:
+            print(f"Error writing {self.namespace} disk cache: {e}")
 
     def delete(self, key: str) -> None:
         """Delete a value from cache"""
-        self._cache.pop(key, None)
+        self._remove(key)
 
     def clear(self) -> None:
         """Clear all values from cache"""
         self._cache.clear()
+        self._buckets.clear()
+        self._bucket_heap.clear()
+        self._scheduled = 0
+        self._bytes = 0
 
     def cleanup(self) -> None:
         """Remove all expired entries"""
-        current_time = time.time()
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if entry.expires_at and current_time > entry.expires_at
-        ]
-        for key in expired_keys:
-            del self._cache[key] 
\ No newline at end of file
+        self._expire(time.time())
+
+    def _remove(self, key: str) -> Optional[CacheEntry]:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        return entry
+
+    def _schedule(self, key: str, expires_at: float) -> None:
+        # Everything in bucket n expires before n, so the bucket is due once n has passed
+        bucket = int(expires_at) + 1
+        keys = self._buckets.get(bucket)
+        if keys is None:
+            keys = self._buckets[bucket] = []
+            heapq.heappush(self._bucket_heap, bucket)
+        keys.append(key)
+        self._scheduled += 1
+
+        # Overwrites and deletes leave stale keys behind, rebuild before they dominate
+        if self._scheduled > 2 * len(self._cache) + 1024:
+            self._buckets.clear()
+            self._bucket_heap.clear()
+            self._scheduled = 0
+            for key, entry in self._cache.items():
+                if entry.expires_at is not None:
+                    self._schedule(key, entry.removal_at)
+
+    def _expire(self, now: float) -> None:
+        """Drop entries from every bucket that is due, skipping stale keys"""
+        heap = self._bucket_heap
+        while heap and heap[0] <= now:
+            bucket = heapq.heappop(heap)
+            keys = self._buckets.pop(bucket)
+            self._scheduled -= len(keys)
+            for key in keys:
+                entry = self._cache.get(key)
+                if entry is not None and entry.expires_at is not None and entry.removal_at < bucket:
+                    self._remove(key)
+                    self.stats.expirations += 1
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until within bounds"""
+        while self._cache and (
+            (self.max_entries is not None and len(self._cache) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, entry = self._cache.popitem(last=False)
+            self._bytes -= entry.size
+            self.stats.evictions += 1
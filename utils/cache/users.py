@@ -0,0 +1,58 @@
+from typing import Any, Dict, Optional, Union
+
+import discord
+
+from .memory import MemoryCache
+
+class UserResolver:
+    """
+    Resolve user IDs with as few REST calls as possible
+    Lookup order is the guild's member cache, the bot's user cache, a bounded TTL cache of
+    users fetched before, then fetch_user; concurrent fetches of one ID share a single request
+    """
+
+    def __init__(self, bot, ttl: int = 600, max_entries: int = 5000):
+        self.bot = bot
+        self.ttl = ttl
+        self.cache = MemoryCache(max_entries=max_entries, namespace='users')
+        self.lookups = 0
+        self.gateway_hits = 0
+
+    async def resolve(
+        self,
+        user_id: int,
+        guild: Optional[discord.Guild] = None,
+        *,
+        full: bool = False
+    ) -> Union[discord.Member, discord.User]:
+        """
+        Member when the user is in the guild, otherwise a User; raises NotFound like fetch_user
+        full skips the gateway caches, whose users lack fields like the banner that only REST returns
+        """
+        self.lookups += 1
+        if not full:
+            user = (guild.get_member(user_id) if guild is not None else None) or self.bot.get_user(user_id)
+            if user is not None:
+                self.gateway_hits += 1
+                return user
+
+        return await self.cache.get_or_load(str(user_id), lambda: self.bot.fetch_user(user_id), ttl=self.ttl)
+
+    def forget(self, user_id: int) -> None:
+        self.cache.delete(str(user_id))
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookups served, REST calls made and REST calls saved"""
+        rest_calls = self.cache.stats.loads
+        return {
+            'lookups': self.lookups,
+            'gateway_hits': self.gateway_hits,
+            'cache_hits': self.cache.stats.hits,
+            'coalesced': self.cache.stats.coalesced,
+            'rest_calls': rest_calls,
+            'rest_saved': self.lookups - rest_calls
+        }
+
+    def reset_stats(self) -> None:
+        self.lookups = self.gateway_hits = 0
+        self.cache.stats.reset()
@@ -0,0 +1,53 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+class PrefixResolver:
+    """Per-guild prefix tuples, longest first so the first match is unambiguous"""
+
+    def __init__(self, settings, default_prefixes: Iterable[str]):
+        self.settings = settings
+        self.default_prefixes = tuple(default_prefixes)
+        self._default = self._compile(None, True)
+        self._cache: Dict[int, Tuple[str, ...]] = {}
+
+        self.settings.subscribe(self._on_setting_change, keys=('prefix', 'use_default_prefix'))
+
+    def _compile(self, custom_prefix: Optional[str], use_default: bool) -> Tuple[str, ...]:
+        prefixes = set(self.default_prefixes) if use_default else set()
+        if custom_prefix:
+            prefixes.add(custom_prefix)
+        if not prefixes:
+            prefixes = set(self.default_prefixes)
+        return tuple(sorted(prefixes, key=lambda p: (-len(p), p)))
+
+    def get(self, guild_id: Optional[int]) -> Tuple[str, ...]:
+        """Get the prefixes for a guild, or the defaults outside guilds"""
+        if guild_id is None:
+            return self._default
+
+        prefixes = self._cache.get(guild_id)
+        if prefixes is None:
+            settings = self.settings.get_server_view(guild_id)
+            prefixes = self._cache[guild_id] = self._compile(
+                settings.get('prefix'),
+                settings.get('use_default_prefix', True)
+            )
+        return prefixes
+
+    def match(self, message) -> Optional[str]:
+        """Return the prefix the message starts with, if any"""
+        prefixes = self.get(message.guild.id if message.guild else None)
+        content = message.content
+        if not content.startswith(prefixes):
+            return None
+
+        for prefix in prefixes:
+            if content.startswith(prefix):
+                return prefix
+        return None
+
+    def invalidate(self, guild_id: int) -> None:
+        """Drop a guild's compiled prefixes"""
+        self._cache.pop(guild_id, None)
+
+    def _on_setting_change(self, guild_id: int, setting: str, old, new) -> None:
+        self.invalidate(guild_id)
@@ -0,0 +1,58 @@
+from typing import Dict, Iterable, Optional
+
+class CommandTrie:
+    """Character trie over command names and aliases"""
+
+    _END = '\0'
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.root: Dict[str, dict] = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        node = self.root
+        for char in name:
+            node = node.setdefault(char, {})
+        node[self._END] = {}
+
+    def match(self, content: str, start: int = 0) -> bool:
+        """Check whether the word starting at start is a known name"""
+        node = self.root
+        for index in range(start, len(content)):
+            char = content[index]
+            if char.isspace():
+                break
+            node = node.get(char)
+            if node is None:
+                return False
+        return self._END in node
+
+class CommandFilter:
+    """Drops messages that cannot invoke a command before a Context is built"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.checked = 0
+        self.short_circuited = 0
+        self._trie: Optional[CommandTrie] = None
+
+    def invalidate(self) -> None:
+        """Rebuild the trie on next use, called when commands are added or removed"""
+        self._trie = None
+
+    def allows(self, message) -> bool:
+        """Check whether message starts with a prefix followed by a known command"""
+        self.checked += 1
+        prefix = self.bot.prefixes.match(message)
+        if prefix is not None:
+            if self._trie is None:
+                self._trie = CommandTrie(self.bot.all_commands)
+            if self._trie.match(message.content, len(prefix)):
+                return True
+
+        self.short_circuited += 1
+        return False
+
+    def reset_stats(self) -> None:
+        self.checked = self.short_circuited = 0
@@ -0,0 +1,110 @@
+"""
+Per-channel embed batching for log channels
+Embeds queued for a channel go out together, up to 10 per message and 6000 characters in total,
+as soon as the batch is full or once its window has passed since the first embed was queued
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+
+import discord
+
+MAX_EMBEDS = 10
+MAX_CHARS = 6000
+
+class _Batch:
+    __slots__ = ('channel', 'embeds', 'size', 'timer')
+
+    def __init__(self, channel: discord.abc.Messageable):
+        self.channel = channel
+        self.embeds: List[discord.Embed] = []
+        self.size = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+class EmbedBatcher:
+    """Coalesces embeds per channel; sends for one channel stay in the order they were queued"""
+
+    def __init__(self):
+        self._pending: Dict[int, _Batch] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.embeds_sent = 0
+        self.messages_sent = 0
+        self.failed = 0
+
+    def add(self, channel: discord.abc.Messageable, embed: discord.Embed, window: float) -> None:
+        """Queue an embed, a window of 0 or less sends it right away"""
+        size = len(embed)
+        batch = self._pending.get(channel.id)
+        if batch is not None and (len(batch.embeds) >= MAX_EMBEDS or batch.size + size > MAX_CHARS):
+            self.flush(channel.id)
+            batch = None
+
+        if batch is None:
+            batch = self._pending[channel.id] = _Batch(channel)
+            if window > 0:
+                batch.timer = asyncio.get_running_loop().call_later(window, self.flush, channel.id)
+
+        batch.embeds.append(embed)
+        batch.size += size
+        if window <= 0 or len(batch.embeds) >= MAX_EMBEDS:
+            self.flush(channel.id)
+
+    def flush(self, channel_id: int) -> None:
+        batch = self._pending.pop(channel_id, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def flush_all(self) -> None:
+        for channel_id in list(self._pending):
+            self.flush(channel_id)
+
+    async def drain(self) -> None:
+        """Flush every pending batch and wait until all sends have finished"""
+        self.flush_all()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _send(self, batch: _Batch) -> None:
+        # Locks wake waiters first come first served, so batches for a channel can't overtake each other
+        lock = self._locks.setdefault(batch.channel.id, asyncio.Lock())
+        async with lock:
+            try:
+                await batch.channel.send(embeds=batch.embeds)
+            except discord.HTTPException as e:
+                if len(batch.embeds) == 1:
+                    self.failed += 1
+                    print(f"Error sending log batch to {batch.channel.id}: {e}")
+                    return
+                # One bad embed rejects the whole message, send them one by one so only it is lost
+                for embed in batch.embeds:
+                    try:
+                        await batch.channel.send(embed=embed)
+                    except discord.HTTPException as e:
+                        self.failed += 1
+                        print(f"Error sending log embed to {batch.channel.id}: {e}")
+                    else:
+                        self.embeds_sent += 1
+                        self.messages_sent += 1
+                return
+            except Exception as e:
+                self.failed += len(batch.embeds)
+                print(f"Error sending log batch to {batch.channel.id}: {e}")
+                return
+            self.embeds_sent += len(batch.embeds)
+            self.messages_sent += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Embeds delivered, messages used for them and the API calls that saved"""
+        return {
+            'embeds_sent': self.embeds_sent,
+            'messages_sent': self.messages_sent,
+            'calls_saved': self.embeds_sent - self.messages_sent,
+            'failed': self.failed,
+            'pending': sum(len(batch.embeds) for batch in self._pending.values())
+        }
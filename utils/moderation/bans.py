@@ -0,0 +1,78 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+
+import discord
+
+BULK_BAN_LIMIT = 200
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+async def bulk_ban(
+    guild: discord.Guild,
+    users: Sequence[discord.abc.Snowflake],
+    *,
+    reason: Optional[str] = None,
+    delete_message_seconds: int = 0,
+    concurrency: int = 5,
+    on_progress: Optional[ProgressCallback] = None
+) -> Tuple[List[discord.abc.Snowflake], List[discord.abc.Snowflake]]:
+    """
+    Ban users through the bulk ban endpoint in chunks of 200, returns (banned, failed)
+    If the bulk route is refused (it also needs Manage Server), falls back to individual
+    bans with at most `concurrency` requests in flight; discord.py waits out 429s per route
+    """
+    users = list(users)
+    banned, failed = [], []
+
+    async def report():
+        if on_progress is not None:
+            await on_progress(len(banned) + len(failed), len(users))
+
+    remaining = users
+    try:
+        while remaining:
+            chunk = remaining[:BULK_BAN_LIMIT]
+            result = await guild.bulk_ban(chunk, reason=reason, delete_message_seconds=delete_message_seconds)
+            remaining = remaining[BULK_BAN_LIMIT:]
+
+            banned_ids = {user.id for user in result.banned}
+            for user in chunk:
+                (banned if user.id in banned_ids else failed).append(user)
+            await report()
+        return banned, failed
+    except (discord.Forbidden, discord.HTTPException):
+        pass
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def ban_one(user):
+        async with semaphore:
+            try:
+                await guild.ban(user, reason=reason, delete_message_seconds=delete_message_seconds)
+                banned.append(user)
+            except (discord.Forbidden, discord.NotFound, discord.HTTPException):
+                failed.append(user)
+            await report()
+
+    await asyncio.gather(*(ban_one(user) for user in remaining))
+    return banned, failed
+
+class ProgressMessage:
+    """Edits a status message at most once per interval so progress doesn't trip the edit rate limit"""
+
+    def __init__(self, message: discord.Message, label: str, interval: float = 2.0):
+        self.message = message
+        self.label = label
+        self.interval = interval
+        self._last_edit = 0.0
+
+    async def __call__(self, done: int, total: int) -> None:
+        now = time.monotonic()
+        if done < total and now - self._last_edit < self.interval:
+            return
+        self._last_edit = now
+        try:
+            await self.message.edit(content=f"{self.label} {done}/{total}...", view=None)
+        except discord.HTTPException:
+            pass
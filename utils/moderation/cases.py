@@ -0,0 +1,244 @@
+"""
+Append-only moderation case log with in-memory indexes
+Each line of data/cases.jsonl is a new case, an edit to one or a removal tombstone; the file is replayed on startup
+"""
+import asyncio
+import base64
+import json
+import os
+import random
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+class CaseStore:
+    def __init__(self, path: str = 'data/cases.jsonl', legacy_path: str = 'data/mod_logs.json'):
+        self.path = path
+        self.legacy_path = legacy_path
+
+        self._cases: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        self._by_user: Dict[Tuple[int, int], List[str]] = {}
+        # Active (not removed) cases only, dicts used as ordered sets so removal is O(1)
+        self._by_action: Dict[Tuple[int, str], Dict[str, None]] = {}
+        self._by_user_action: Dict[Tuple[int, int, str], Dict[str, None]] = {}
+
+        self._lock = asyncio.Lock()
+        self._last_case_time = 0
+        self._case_counter = 0
+
+        self.load()
+
+    #################################
+    ## Loading
+    #################################
+    def load(self) -> None:
+        """Replay the case log, importing the legacy mod_logs.json the first time"""
+        if not os.path.exists(self.path) and os.path.exists(self.legacy_path):
+            count = self.import_legacy(self.legacy_path)
+            print(f"Imported {count} cases from {self.legacy_path}")
+
+        try:
+            f = open(self.path, 'rb+')
+        except FileNotFoundError:
+            f = None
+
+        if f is not None:
+            with f:
+                offset = 0
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        if not line.endswith(b'\n'):
+                            # A crash mid-append leaves a partial last line, cut it off so the
+                            # next append doesn't get glued onto it
+                            f.truncate(offset)
+                            break
+                        offset += len(line)
+                        continue
+                    self._apply(entry)
+                    offset += len(line)
+                    if not line.endswith(b'\n'):
+                        f.write(b'\n')
+
+        self._file = open(self.path, 'a', buffering=1)
+
+    def import_legacy(self, legacy_path: str) -> int:
+        """Write every case from a mod_logs.json file into a new case log, returns the case count"""
+        with open(legacy_path, 'r') as f:
+            records = json.load(f)
+
+        lines = []
+        for guild_id, guild_records in records.items():
+            usernames = {
+                user_id: user_data.get('username')
+                for user_id, user_data in guild_records.get('users', {}).items()
+            }
+            for case_id, case in guild_records.get('cases', {}).items():
+                case = {**case, 'case_id': case_id}
+                case.setdefault('username', usernames.get(str(case.get('user_id'))))
+                lines.append(json.dumps({'op': 'case', 'guild': guild_id, 'case': case}))
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(''.join(f"{line}\n" for line in lines))
+        os.replace(tmp_path, self.path)
+        return len(lines)
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        guild_id = int(entry['guild'])
+        if entry['op'] == 'case':
+            case = entry['case']
+            case_id, user_id, action = case['case_id'], int(case['user_id']), case['action']
+            self._cases[(guild_id, case_id)] = case
+            self._by_user.setdefault((guild_id, user_id), []).append(case_id)
+            if not case.get('removed'):
+                self._by_action.setdefault((guild_id, action), {})[case_id] = None
+                self._by_user_action.setdefault((guild_id, user_id, action), {})[case_id] = None
+        elif entry['op'] == 'edit':
+            case = self._cases.get((guild_id, entry['case_id']))
+            if case is not None:
+                case.update(entry['changes'])
+        elif entry['op'] == 'remove':
+            for case_id in entry['case_ids']:
+                case = self._cases.get((guild_id, case_id))
+                if case is None or case.get('removed'):
+                    continue
+                case.update(removed=True, removed_by=entry['mod_id'], removed_at=entry['timestamp'])
+                user_id, action = int(case['user_id']), case['action']
+                self._by_action.get((guild_id, action), {}).pop(case_id, None)
+                self._by_user_action.get((guild_id, user_id, action), {}).pop(case_id, None)
+
+    def _append(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Apply and persist entries, callers hold the lock so lines stay whole and in order"""
+        lines = []
+        for entry in entries:
+            self._apply(entry)
+            lines.append(json.dumps(entry))
+        self._file.write(''.join(f"{line}\n" for line in lines))
+
+    #################################
+    ## Writing
+    #################################
+    def _new_case_id(self, guild_id: int) -> str:
+        """Timestamp-based ID, rerolled on the rare collision"""
+        while True:
+            current_time = int(time.time())
+            if current_time == self._last_case_time:
+                self._case_counter += 1
+            else:
+                self._last_case_time = current_time
+                self._case_counter = 0
+
+            unique_num = (current_time << 16) | ((self._case_counter & 0xFF) << 8) | random.randint(0, 255)
+            # The low 40 bits encode to exactly 8 base32 characters and still change every second
+            case_id = base64.b32encode(unique_num.to_bytes(8, 'big')[3:]).decode('utf-8')
+            if (guild_id, case_id) not in self._cases:
+                return case_id
+
+    async def add(self, guild_id: int, case: Dict[str, Any]) -> str:
+        """Record a new case, returns its ID"""
+        return (await self.add_many(guild_id, [case]))[0]
+
+    async def add_many(self, guild_id: int, cases: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Record several cases with one write, returns their IDs
+        Cases that already carry a case_id (imports) keep it and are skipped if it exists
+        """
+        guild_id = int(guild_id)
+        async with self._lock:
+            timestamp = datetime.utcnow().isoformat()
+            entries, case_ids = [], []
+            for case in cases:
+                if 'case_id' in case:
+                    if (guild_id, case['case_id']) in self._cases:
+                        continue
+                else:
+                    case['case_id'] = self._new_case_id(guild_id)
+                case.setdefault('timestamp', timestamp)
+                entries.append({'op': 'case', 'guild': str(guild_id), 'case': case})
+                case_ids.append(case['case_id'])
+            self._append(entries)
+        return case_ids
+
+    async def edit(self, guild_id: int, case_id: str, **changes) -> Optional[Dict[str, Any]]:
+        """Update fields of an existing case, returns it or None if it doesn't exist"""
+        guild_id = int(guild_id)
+        async with self._lock:
+            case = self._cases.get((guild_id, case_id))
+            if case is None:
+                return None
+            self._append([{'op': 'edit', 'guild': str(guild_id), 'case_id': case_id, 'changes': changes}])
+        return case
+
+    async def remove(self, guild_id: int, case_ids: Iterable[str], mod_id: int) -> List[Dict[str, Any]]:
+        """Tombstone active cases so they drop out of action lookups, returns the ones removed"""
+        guild_id = int(guild_id)
+        async with self._lock:
+            removed = [
+                self._cases[(guild_id, case_id)] for case_id in dict.fromkeys(case_ids)
+                if (guild_id, case_id) in self._cases and not self._cases[(guild_id, case_id)].get('removed')
+            ]
+            if removed:
+                self._append([{
+                    'op': 'remove',
+                    'guild': str(guild_id),
+                    'case_ids': [case['case_id'] for case in removed],
+                    'mod_id': mod_id,
+                    'timestamp': datetime.utcnow().isoformat()
+                }])
+        return removed
+
+    #################################
+    ## Reading
+    #################################
+    def get(self, guild_id: int, case_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single case"""
+        return self._cases.get((int(guild_id), case_id))
+
+    def _resolve(self, guild_id: int, case_ids, limit: Optional[int]) -> List[Dict[str, Any]]:
+        if limit is not None:
+            case_ids = list(islice(reversed(case_ids), limit))[::-1]
+        return [self._cases[(guild_id, case_id)] for case_id in case_ids]
+
+    def for_user(self, guild_id: int, user_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """A user's cases in a guild including removed ones, oldest first, optionally only the latest limit"""
+        guild_id = int(guild_id)
+        return self._resolve(guild_id, self._by_user.get((guild_id, int(user_id)), []), limit)
+
+    def page_for_user(self, guild_id: int, user_id: int, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """limit of a user's cases newest first, skipping the offset most recent"""
+        guild_id = int(guild_id)
+        case_ids = self._by_user.get((guild_id, int(user_id)), [])
+        end = max(len(case_ids) - offset, 0)
+        return [self._cases[(guild_id, case_id)] for case_id in reversed(case_ids[max(end - limit, 0):end])]
+
+    def count_for_user(self, guild_id: int, user_id: int) -> int:
+        return len(self._by_user.get((int(guild_id), int(user_id)), ()))
+
+    def for_action(self, guild_id: int, action: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Every active case of one action type in a guild, oldest first"""
+        guild_id = int(guild_id)
+        return self._resolve(guild_id, self._by_action.get((guild_id, action), {}), limit)
+
+    def for_user_action(self, guild_id: int, user_id: int, action: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """A user's active cases of one action type, oldest first"""
+        guild_id = int(guild_id)
+        return self._resolve(guild_id, self._by_user_action.get((guild_id, int(user_id), action), {}), limit)
+
+    def all_for_action(self, action: str) -> Iterable[Tuple[int, Dict[str, Any]]]:
+        """(guild_id, case) for every active case of one action type across all guilds"""
+        for (guild_id, indexed_action), case_ids in list(self._by_action.items()):
+            if indexed_action == action:
+                for case_id in list(case_ids):
+                    yield guild_id, self._cases[(guild_id, case_id)]
+
+    def count_for_action(self, guild_id: int, action: str) -> int:
+        return len(self._by_action.get((int(guild_id), action), ()))
+
+    def count_for_user_action(self, guild_id: int, user_id: int, action: str) -> int:
+        return len(self._by_user_action.get((int(guild_id), int(user_id), action), ()))
+
+    def close(self) -> None:
+        self._file.close()
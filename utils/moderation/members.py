@@ -0,0 +1,179 @@
+"""
+Per-guild member indexes for selecting raid accounts by join time and account age
+Both timelines are kept as sorted typed arrays, so a window query is two bisects and a slice
+"""
+import re
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set
+
+import discord
+
+from utils.helpers.time import TimeParser
+
+class TimeIndex:
+    """Member IDs ordered by a timestamp"""
+
+    def __init__(self, pairs: Iterable[tuple] = ()):
+        pairs = sorted(pairs)
+        self.times = array('d', (t for t, _ in pairs))
+        self.ids = array('q', (member_id for _, member_id in pairs))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, timestamp: float, member_id: int) -> None:
+        # Joins almost always land at the end, skip the bisect for them
+        if not self.times or timestamp >= self.times[-1]:
+            self.times.append(timestamp)
+            self.ids.append(member_id)
+            return
+        i = bisect_left(self.times, timestamp)
+        self.times.insert(i, timestamp)
+        self.ids.insert(i, member_id)
+
+    def remove(self, timestamp: float, member_id: int) -> None:
+        i = bisect_left(self.times, timestamp)
+        while i < len(self.times) and self.times[i] == timestamp:
+            if self.ids[i] == member_id:
+                del self.times[i]
+                del self.ids[i]
+                return
+            i += 1
+
+    def since(self, timestamp: float) -> array:
+        """IDs with a timestamp at or after the given one"""
+        return self.ids[bisect_left(self.times, timestamp):]
+
+class MemberIndex:
+    """Join and account-creation timelines for one guild"""
+
+    def __init__(self, members: Iterable[discord.Member]):
+        members = list(members)
+        self.joined = TimeIndex((m.joined_at.timestamp(), m.id) for m in members if m.joined_at)
+        self.created = TimeIndex((m.created_at.timestamp(), m.id) for m in members)
+
+    def add(self, member: discord.Member) -> None:
+        if member.joined_at:
+            self.joined.add(member.joined_at.timestamp(), member.id)
+        self.created.add(member.created_at.timestamp(), member.id)
+
+    def remove(self, member: discord.Member) -> None:
+        if member.joined_at:
+            self.joined.remove(member.joined_at.timestamp(), member.id)
+        self.created.remove(member.created_at.timestamp(), member.id)
+
+    def select(self, joined_after: Optional[float] = None, created_after: Optional[float] = None) -> Optional[Set[int]]:
+        """IDs inside both windows, None when neither window is given"""
+        ranges = []
+        if joined_after is not None:
+            ranges.append(self.joined.since(joined_after))
+        if created_after is not None:
+            ranges.append(self.created.since(created_after))
+        if not ranges:
+            return None
+
+        ranges.sort(key=len)
+        result = set(ranges[0])
+        for other in ranges[1:]:
+            result.intersection_update(other)
+        return result
+
+class MemberIndexes:
+    """Lazily built MemberIndex per guild, kept current from member join/leave events"""
+
+    def __init__(self):
+        self._guilds: Dict[int, MemberIndex] = {}
+
+    def get(self, guild: discord.Guild) -> MemberIndex:
+        index = self._guilds.get(guild.id)
+        if index is None:
+            index = self._guilds[guild.id] = MemberIndex(guild.members)
+        return index
+
+    def add(self, member: discord.Member) -> None:
+        index = self._guilds.get(member.guild.id)
+        if index is not None:
+            index.add(member)
+
+    def remove(self, member: discord.Member) -> None:
+        index = self._guilds.get(member.guild.id)
+        if index is not None:
+            index.remove(member)
+
+    def drop(self, guild_id: int) -> None:
+        self._guilds.pop(guild_id, None)
+
+# reason is consumed by massban itself rather than the criteria
+FLAGS = frozenset({'joined', 'created', 'name', 'no-avatar', 'reason'})
+
+class MemberCriteria:
+    """
+    Selection flags for massban
+    --joined 30m    joined within the window
+    --created 7d    account younger than the window
+    --name regex    username, global name or nickname matches
+    --no-avatar     still using a default avatar
+    """
+
+    def __init__(self, joined: Optional[int] = None, created: Optional[int] = None, name: Optional[re.Pattern] = None, no_avatar: bool = False):
+        self.joined = joined
+        self.created = created
+        self.name = name
+        self.no_avatar = no_avatar
+
+    @classmethod
+    def from_flags(cls, flags: Dict[str, object]) -> 'MemberCriteria':
+        """Build criteria from parse_flags output, raises ValueError on unknown flags and bad values"""
+        unknown = sorted(set(flags) - FLAGS)
+        if unknown:
+            raise ValueError("Unknown flag " + ", ".join(f"`--{flag}`" for flag in unknown))
+
+        def window(flag):
+            if flag not in flags:
+                return None
+            seconds = TimeParser.parse_time_string(flags[flag]) if isinstance(flags[flag], str) else None
+            if not seconds:
+                raise ValueError(f"`--{flag}` needs a duration like 30m, 12h or 7d")
+            return seconds
+
+        name = None
+        if 'name' in flags:
+            if not isinstance(flags['name'], str):
+                raise ValueError("`--name` needs a pattern")
+            try:
+                name = re.compile(flags['name'], re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Invalid `--name` pattern: {e}")
+
+        return cls(window('joined'), window('created'), name, 'no-avatar' in flags)
+
+    @property
+    def empty(self) -> bool:
+        return self.joined is None and self.created is None and self.name is None and not self.no_avatar
+
+    def _matches(self, member: discord.Member) -> bool:
+        if self.no_avatar and member.avatar is not None:
+            return False
+        if self.name is not None and not any(
+            self.name.search(name) for name in (member.name, member.global_name, member.nick) if name
+        ):
+            return False
+        return True
+
+    def select(self, guild: discord.Guild, indexes: MemberIndexes) -> List[discord.Member]:
+        """Members matching every criterion, newest joins first"""
+        now = datetime.now(timezone.utc).timestamp()
+        ids = indexes.get(guild).select(
+            joined_after=now - self.joined if self.joined is not None else None,
+            created_after=now - self.created if self.created is not None else None
+        )
+
+        candidates = guild.members if ids is None else filter(None, map(guild.get_member, ids))
+        members = [
+            member for member in candidates
+            if not member.bot and member.id != guild.owner_id and self._matches(member)
+        ]
+        members.sort(key=lambda m: m.joined_at or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
+        return members
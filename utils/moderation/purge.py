@@ -0,0 +1,289 @@
+"""
+Purge filter engine
+Criteria are compiled once into a list of checks that every message must pass, and matches are
+deleted in bulk chunks of 100 while they are young enough, one at a time after that
+"""
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set
+
+import discord
+
+LINK_REGEX = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+EMOJI_REGEX = re.compile(r'<a?:\w+:\d+>')
+USER_REGEX = re.compile(r'<@!?(\d+)>|(\d{15,20})')
+
+FLAGS = frozenset({
+    'user', 'bots', 'humans', 'prefix', 'contains', 'regex', 'links', 'emoji',
+    'embeds', 'files', 'mentions', 'after', 'before', 'pinned'
+})
+
+BULK_DELETE_LIMIT = 100
+# Discord refuses bulk deletes of anything older than 14 days, keep a margin for the scan time
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+
+class PurgeFilter:
+    """
+    Combinable purge criteria, a message must match all of them
+    --user @x       authored by any of the given users (mentions or IDs)
+    --bots          authored by a bot, or starting with --prefix if one is given
+    --humans        authored by a human
+    --contains foo  content contains foo (case insensitive)
+    --regex expr    content matches expr
+    --links --emoji --embeds --files --mentions
+    --after id / --before id    only messages after/before that message
+    --pinned        include pinned messages, skipped by default
+    """
+
+    def __init__(
+        self,
+        users: Optional[Set[int]] = None,
+        bots: bool = False,
+        humans: bool = False,
+        prefix: Optional[str] = None,
+        contains: Optional[str] = None,
+        regex: Optional[re.Pattern] = None,
+        links: bool = False,
+        emoji: bool = False,
+        embeds: bool = False,
+        files: bool = False,
+        mentions: bool = False,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        pinned: bool = False
+    ):
+        self.users = users
+        self.bots = bots
+        self.humans = humans
+        self.prefix = prefix
+        self.contains = contains
+        self.regex = regex
+        self.links = links
+        self.emoji = emoji
+        self.embeds = embeds
+        self.files = files
+        self.mentions = mentions
+        self.after = after
+        self.before = before
+        self.pinned = pinned
+
+    @classmethod
+    def from_flags(
+        cls,
+        text: str,
+        flags: Dict[str, object],
+        resolve_user: Optional[Callable[[str], Optional[int]]] = None
+    ) -> 'PurgeFilter':
+        """
+        Build a filter from parse_flags output; users given before the first flag count as --user
+        Users are mentions or IDs, or names when resolve_user maps them to an ID
+        Raises ValueError on unknown flags, users that don't resolve and bad values
+        """
+        unknown = sorted(set(flags) - FLAGS)
+        if unknown:
+            raise ValueError("Unknown flag " + ", ".join(f"`--{flag}`" for flag in unknown))
+
+        def user_ids(value):
+            ids = set()
+            for token in value.split():
+                match = USER_REGEX.fullmatch(token)
+                user_id = int(match.group(1) or match.group(2)) if match else None
+                if user_id is None and resolve_user is not None:
+                    user_id = resolve_user(token)
+                if user_id is None:
+                    raise ValueError(f"Could not find a member named `{token}`, use a mention or ID")
+                ids.add(user_id)
+            return ids
+
+        def value(flag):
+            if not isinstance(flags.get(flag), str):
+                raise ValueError(f"`--{flag}` needs a value")
+            return flags[flag]
+
+        def message_id(flag):
+            if flag not in flags:
+                return None
+            if not value(flag).isdigit():
+                raise ValueError(f"`--{flag}` needs a message ID")
+            return int(flags[flag])
+
+        users = user_ids(text.split('--', 1)[0])
+        if 'user' in flags:
+            users.update(user_ids(value('user')))
+
+        regex = None
+        if 'regex' in flags:
+            try:
+                regex = re.compile(value('regex'), re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Invalid `--regex` pattern: {e}")
+
+        purge_filter = cls(
+            users=users or None,
+            bots='bots' in flags,
+            humans='humans' in flags,
+            prefix=value('prefix') if 'prefix' in flags else None,
+            contains=value('contains') if 'contains' in flags else None,
+            regex=regex,
+            links='links' in flags,
+            emoji='emoji' in flags,
+            embeds='embeds' in flags,
+            files='files' in flags,
+            mentions='mentions' in flags,
+            after=message_id('after'),
+            before=message_id('before'),
+            pinned='pinned' in flags
+        )
+        if text.strip() and purge_filter.describe() is None:
+            raise ValueError("Those arguments don't narrow the purge down, run it without arguments to purge everything")
+        return purge_filter
+
+    def compile(self) -> Callable[[discord.Message], bool]:
+        """Build the predicate once; only the checks that were asked for are run per message"""
+        checks: List[Callable[[discord.Message], bool]] = []
+
+        if not self.pinned:
+            checks.append(lambda m: not m.pinned)
+        if self.users:
+            users = frozenset(self.users)
+            checks.append(lambda m: m.author.id in users)
+        if self.bots and self.prefix:
+            prefix = self.prefix
+            checks.append(lambda m: m.author.bot or m.content.startswith(prefix))
+        elif self.bots:
+            checks.append(lambda m: m.author.bot)
+        elif self.prefix:
+            prefix = self.prefix
+            checks.append(lambda m: m.content.startswith(prefix))
+        if self.humans:
+            checks.append(lambda m: not m.author.bot)
+        if self.contains:
+            needle = self.contains.lower()
+            checks.append(lambda m: needle in m.content.lower())
+        if self.regex is not None:
+            search = self.regex.search
+            checks.append(lambda m: search(m.content) is not None)
+        if self.links:
+            checks.append(lambda m: LINK_REGEX.search(m.content) is not None)
+        if self.emoji:
+            checks.append(lambda m: EMOJI_REGEX.search(m.content) is not None)
+        if self.embeds:
+            checks.append(lambda m: bool(m.embeds or m.attachments))
+        if self.files:
+            checks.append(lambda m: bool(m.attachments))
+        if self.mentions:
+            checks.append(lambda m: bool(m.mentions or m.role_mentions or m.mention_everyone))
+
+        if len(checks) == 1:
+            return checks[0]
+        return lambda m: all(check(m) for check in checks)
+
+    def describe(self) -> Optional[str]:
+        """Short summary of the criteria for the audit log"""
+        parts = []
+        if self.users:
+            parts.append("from " + ", ".join(f"<@{user_id}>" for user_id in self.users))
+        if self.bots:
+            parts.append("bot messages" + (f" or prefix `{self.prefix}`" if self.prefix else ""))
+        elif self.prefix:
+            parts.append(f"prefix `{self.prefix}`")
+        if self.humans:
+            parts.append("human messages")
+        if self.contains:
+            parts.append(f"containing `{self.contains}`")
+        if self.regex is not None:
+            parts.append(f"matching `{self.regex.pattern}`")
+        for flag, label in (
+            ('links', "with links"), ('emoji', "with custom emoji"), ('embeds', "with embeds"),
+            ('files', "with attachments"), ('mentions', "with mentions")
+        ):
+            if getattr(self, flag):
+                parts.append(label)
+        if self.after:
+            parts.append(f"after {self.after}")
+        if self.before:
+            parts.append(f"before {self.before}")
+        if self.pinned:
+            parts.append("including pinned")
+        return ", ".join(parts) or None
+
+async def purge_channel(
+    channel: discord.abc.Messageable,
+    limit: int,
+    predicate: Callable[[discord.Message], bool],
+    *,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    after_time: Optional[datetime] = None,
+    old_delete_delay: float = 1.0
+) -> List[discord.Message]:
+    """
+    Scan up to limit messages newest first and delete the matching ones, returns what was deleted
+    The scan stops at the after message or at after_time, whichever is given; history() is never
+    handed an after bound because that flips it to oldest first and the newest messages go unscanned
+    Recent matches go out in bulk deletes of up to 100 while scanning; older ones are deleted
+    individually afterwards, paced by old_delete_delay on top of discord.py's rate limit handling
+    """
+    cutoff = datetime.now(timezone.utc) - BULK_DELETE_MAX_AGE
+    deleted: List[discord.Message] = []
+    recent: List[discord.Message] = []
+    old: List[discord.Message] = []
+
+    async def flush_recent():
+        if len(recent) == 1:
+            await recent[0].delete()
+        elif recent:
+            await channel.delete_messages(recent)
+        deleted.extend(recent)
+        recent.clear()
+
+    async for message in channel.history(limit=limit, before=discord.Object(id=before) if before else None):
+        if after is not None and message.id <= after:
+            break
+        if after_time is not None and message.created_at < after_time:
+            break
+        if not predicate(message):
+            continue
+        if message.created_at > cutoff:
+            recent.append(message)
+            if len(recent) == BULK_DELETE_LIMIT:
+                await flush_recent()
+        else:
+            old.append(message)
+    await flush_recent()
+
+    for message in old:
+        try:
+            await message.delete()
+            deleted.append(message)
+        except discord.NotFound:
+            pass
+        await asyncio.sleep(old_delete_delay)
+
+    return deleted
+
+async def purge_channels(
+    channels: List[discord.abc.Messageable],
+    limit: int,
+    predicate: Callable[[discord.Message], bool],
+    *,
+    after_time: Optional[datetime] = None,
+    concurrency: int = 5
+) -> Dict[discord.abc.Messageable, int]:
+    """Purge several channels with at most `concurrency` scans in flight, returns deleted counts per channel"""
+    semaphore = asyncio.Semaphore(concurrency)
+    counts: Dict[discord.abc.Messageable, int] = {}
+
+    async def purge_one(channel):
+        async with semaphore:
+            try:
+                deleted = await purge_channel(channel, limit, predicate, after_time=after_time)
+            except discord.HTTPException as e:
+                print(f"Error purging {channel}: {e}")
+                return
+            if deleted:
+                counts[channel] = len(deleted)
+
+    await asyncio.gather(*(purge_one(channel) for channel in channels))
+    return counts
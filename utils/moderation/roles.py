@@ -0,0 +1,110 @@
+"""
+Fuzzy role lookup
+Role names are normalised and split into trigrams; a query only runs an edit distance against
+the roles sharing the most trigrams with it, and that distance gives up past a bound
+"""
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+def normalize(name: str) -> str:
+    """Casefold and drop accents, spacing, punctuation and emoji"""
+    decomposed = unicodedata.normalize('NFKD', name.casefold())
+    normalized = ''.join(ch for ch in decomposed if ch.isalnum())
+    return normalized or name.casefold().strip()
+
+def trigrams(text: str) -> set:
+    padded = f"$${text}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def bounded_levenshtein(a: str, b: str, bound: int) -> int:
+    """Edit distance between a and b, or bound + 1 as soon as it must exceed bound"""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    if len(a) > len(b):
+        a, b = b, a
+
+    previous = list(range(len(a) + 1))
+    for i, cb in enumerate(b, 1):
+        current = [i]
+        for j, ca in enumerate(a, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            ))
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return previous[-1]
+
+class RoleIndex:
+    """Normalised names and trigram postings for one guild's roles"""
+
+    def __init__(self, roles: List[discord.Role], shortlist: int = 20):
+        self.shortlist = shortlist
+        self._exact: Dict[str, int] = {}
+        self._normalized: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._postings: Dict[str, List[int]] = {}
+
+        # Highest roles first, so exact-name ties resolve to the higher role
+        for role in sorted(roles, key=lambda r: r.position, reverse=True):
+            if role.is_default():
+                continue
+            name = normalize(role.name)
+            self._exact.setdefault(role.name.casefold(), role.id)
+            self._normalized.setdefault(name, role.id)
+            self._names[role.id] = name
+            for gram in trigrams(name):
+                self._postings.setdefault(gram, []).append(role.id)
+
+    def find(self, query: str) -> Optional[int]:
+        """Best matching role ID for a name, None when nothing is close enough"""
+        role_id = self._exact.get(query.casefold())
+        if role_id is not None:
+            return role_id
+
+        target = normalize(query)
+        role_id = self._normalized.get(target)
+        if role_id is not None:
+            return role_id
+
+        shared = Counter()
+        for gram in trigrams(target):
+            shared.update(self._postings.get(gram, ()))
+
+        best: Optional[Tuple[int, int]] = None
+        for role_id, _ in shared.most_common(self.shortlist):
+            name = self._names[role_id]
+            if target in name or name in target:
+                # Containment is always accepted, ranked by how much is left over
+                distance = abs(len(name) - len(target))
+            else:
+                bound = max(len(name), len(target)) // 2
+                if best is not None:
+                    bound = min(bound, best[0])
+                distance = bounded_levenshtein(target, name, bound)
+                if distance > bound:
+                    continue
+            if best is None or distance < best[0]:
+                best = (distance, role_id)
+        return best[1] if best else None
+
+class RoleIndexes:
+    """Per-guild RoleIndex built on first lookup and dropped whenever the guild's roles change"""
+
+    def __init__(self):
+        self._guilds: Dict[int, RoleIndex] = {}
+
+    def find(self, guild: discord.Guild, query: str) -> Optional[discord.Role]:
+        index = self._guilds.get(guild.id)
+        if index is None:
+            index = self._guilds[guild.id] = RoleIndex(guild.roles)
+        role_id = index.find(query)
+        return guild.get_role(role_id) if role_id is not None else None
+
+    def invalidate(self, guild_id: int) -> None:
+        self._guilds.pop(guild_id, None)
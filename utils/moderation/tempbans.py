@@ -0,0 +1,158 @@
+"""
+Durable tempban expiry
+Pending expiries live in a min-heap keyed by the case's expires_at with a single timer task
+sleeping until the nearest one; the case store is the source of truth across restarts
+"""
+import asyncio
+import heapq
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import discord
+
+from .cases import CaseStore
+
+ExpiredCallback = Callable[[discord.Guild, List[Dict[str, Any]]], Awaitable[None]]
+
+# Actions that leave a user banned for good, a tempban followed by one of these must not be lifted
+PERMANENT_BANS = frozenset({'Ban', 'Silent Ban', 'Massban'})
+
+class TempbanScheduler:
+    def __init__(self, bot, cases: CaseStore, on_expired: Optional[ExpiredCallback] = None, concurrency: int = 5):
+        self.bot = bot
+        self.cases = cases
+        self.on_expired = on_expired
+        self.concurrency = concurrency
+
+        self._heap: List[Tuple[int, int, str]] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def is_pending(case: Dict[str, Any]) -> bool:
+        return case.get('expires_at') is not None and 'unbanned_at' not in case and not case.get('removed')
+
+    def superseded(self, guild_id: int, case: Dict[str, Any]) -> bool:
+        """Whether the user was permanently banned after this tempban"""
+        issued = case.get('timestamp') or ''
+        return any(
+            other['action'] in PERMANENT_BANS and not other.get('removed') and (other.get('timestamp') or '') > issued
+            for other in self.cases.for_user(guild_id, case['user_id'])
+        )
+
+    def schedule(self, guild_id: int, case: Dict[str, Any]) -> None:
+        """Track a tempban case, waking the timer if it is now the nearest expiry"""
+        entry = (int(case['expires_at']), int(guild_id), case['case_id'])
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] == entry:
+            self._wakeup.set()
+
+    #################################
+    ## Startup
+    #################################
+    def start(self) -> None:
+        """Start the timer task, which first reconciles pending tempbans with the ban lists"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _reconcile(self) -> None:
+        pending: Dict[int, List[Dict[str, Any]]] = {}
+        for guild_id, case in self.cases.all_for_action('Tempban'):
+            if self.is_pending(case):
+                pending.setdefault(guild_id, []).append(case)
+
+        now = int(time.time())
+        for guild_id, guild_cases in pending.items():
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                continue
+
+            try:
+                banned = {entry.user.id async for entry in guild.bans(limit=None)}
+
+                overdue = []
+                for case in guild_cases:
+                    if case['user_id'] not in banned:
+                        # Unbanned by hand while we were offline
+                        await self._resolve(guild.id, case, 'lifted')
+                    elif case['expires_at'] <= now:
+                        overdue.append(case)
+                    else:
+                        self.schedule(guild_id, case)
+
+                if overdue:
+                    await self._expire(guild, overdue)
+            except Exception as e:
+                print(f"Error reconciling tempbans in {guild_id}: {e}")
+                for case in guild_cases:
+                    self.schedule(guild_id, case)
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    #################################
+    ## Timer
+    #################################
+    async def _run(self) -> None:
+        await self._reconcile()
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.time()
+            due: Dict[int, Dict[str, Dict[str, Any]]] = {}
+            while self._heap and self._heap[0][0] <= now:
+                _, guild_id, case_id = heapq.heappop(self._heap)
+                case = self.cases.get(guild_id, case_id)
+                if case is not None and self.is_pending(case):
+                    due.setdefault(guild_id, {})[case_id] = case
+
+            for guild_id, guild_cases in due.items():
+                guild = self.bot.get_guild(guild_id)
+                if guild is not None:
+                    try:
+                        await self._expire(guild, list(guild_cases.values()))
+                    except Exception as e:
+                        print(f"Error expiring tempbans in {guild_id}: {e}")
+
+    async def _expire(self, guild: discord.Guild, guild_cases: List[Dict[str, Any]]) -> None:
+        """Unban a batch of users with bounded concurrency and record the outcome on each case"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        expired = []
+
+        async def unban(case):
+            if self.superseded(guild.id, case):
+                await self._resolve(guild.id, case, 'superseded')
+                return
+            async with semaphore:
+                try:
+                    await guild.unban(discord.Object(id=case['user_id']), reason=f"Tempban expired (case {case['case_id']})")
+                except discord.NotFound:
+                    await self._resolve(guild.id, case, 'lifted')
+                    return
+                except discord.HTTPException as e:
+                    print(f"Error lifting tempban {case['case_id']}: {e}")
+                    self.schedule(guild.id, {**case, 'expires_at': int(time.time()) + 60})
+                    return
+                await self._resolve(guild.id, case, 'expired')
+                expired.append(case)
+
+        await asyncio.gather(*(unban(case) for case in guild_cases))
+        if expired and self.on_expired is not None:
+            await self.on_expired(guild, expired)
+
+    async def _resolve(self, guild_id: int, case: Dict[str, Any], outcome: str) -> None:
+        await self.cases.edit(guild_id, case['case_id'], unbanned_at=datetime.utcnow().isoformat(), unban_reason=outcome)
@@ -0,0 +1,264 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Any, Optional, Set, Tuple
+
+class JSONBackend:
+    """
+    JSON snapshot plus an append-only journal of mutations
+    Each write appends one line; a periodic compaction folds the journal into a new snapshot
+    """
+
+    def __init__(self, path: str = 'data/settings.json', flush_interval: float = 5.0):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.compacting_path = f"{path}.journal.compacting"
+        self.flush_interval = flush_interval
+        self.settings: Dict[str, Dict[str, Any]] = {}
+
+        self._dirty: Set[str] = set()
+        self._pending_writes = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+        self._snapshot_seq = 0
+        self._written_seq = 0
+        self.coalesced_writes = 0
+
+        self.load()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the snapshot and replay any journal written after it"""
+        try:
+            with open(self.path, 'r') as f:
+                self.settings = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.settings = {}
+
+        # Snapshots interrupted before os.replace leave their temp file behind
+        directory = os.path.dirname(self.path) or '.'
+        for name in os.listdir(directory) if os.path.isdir(directory) else ():
+            if name.startswith('.settings-') and name.endswith('.tmp'):
+                os.unlink(os.path.join(directory, name))
+
+        replayed = 0
+        for journal in (self.compacting_path, self.journal_path):
+            replayed += self._replay(journal)
+
+        self._journal = open(self.journal_path, 'a', buffering=1)
+        if replayed:
+            # Fold the replayed entries (and any torn tail) into a clean snapshot right away
+            self._dirty.add('*')
+            self._pending_writes += 1
+            self.flush()
+        return self.settings
+
+    def _replay(self, journal: str) -> int:
+        try:
+            f = open(journal, 'r')
+        except FileNotFoundError:
+            return 0
+
+        count = 0
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves a partial last line, count it so it gets compacted away
+                    return count + 1
+                self._apply(entry)
+                count += 1
+        return count
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        op, guild_id = entry['op'], entry['guild']
+        if op == 'set':
+            self.settings.setdefault(guild_id, {})[entry['key']] = entry['value']
+        elif op == 'remove':
+            self.settings.get(guild_id, {}).pop(entry['key'], None)
+        elif op == 'clear':
+            self.settings.pop(guild_id, None)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """Apply a mutation and record it in the journal"""
+        self._apply(entry)
+        self._journal.write(json.dumps(entry) + '\n')
+
+        self._dirty.add(entry['guild'])
+        self._pending_writes += 1
+
+    def load_guild(self, guild_id: str) -> Dict[str, Any]:
+        """The whole file is resident, so this hands out the live guild dict"""
+        return self.settings.get(guild_id, {})
+
+    def load_setting(self, guild_id: str, setting: str, default: Any = None) -> Any:
+        return self.settings.get(guild_id, {}).get(setting, default)
+
+    def set(self, guild_id: str, setting: str, value: Any) -> None:
+        self._append({'op': 'set', 'guild': guild_id, 'key': setting, 'value': value})
+
+    def remove(self, guild_id: str, setting: str) -> None:
+        if guild_id in self.settings:
+            self._append({'op': 'remove', 'guild': guild_id, 'key': setting})
+
+    def clear(self, guild_id: str) -> None:
+        if guild_id in self.settings:
+            self._append({'op': 'clear', 'guild': guild_id})
+
+    #################################
+    ## Compaction
+    #################################
+    def _write_snapshot(self, seq: int, payload: str) -> None:
+        """Atomically replace the settings file with payload"""
+        with self._write_lock:
+            # A newer snapshot may already have landed (e.g. shutdown flush racing the flusher)
+            if seq <= self._written_seq:
+                return
+            self._replace_file(payload)
+            self._written_seq = seq
+
+    def _replace_file(self, payload: str) -> None:
+        directory = os.path.dirname(self.path) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.settings-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _take_snapshot(self) -> Optional[Tuple[int, str]]:
+        """
+        Serialise settings and move the journal aside so new writes start a fresh one
+        The moved journal is only deleted once a snapshot containing it has landed
+        """
+        if not self._dirty:
+            return None
+
+        self.coalesced_writes += self._pending_writes - 1
+        self._pending_writes = 0
+        self._dirty.clear()
+
+        self._journal.close()
+        if os.path.exists(self.compacting_path):
+            # The previous compaction never landed, keep its entries ahead of ours
+            with open(self.journal_path, 'r') as src, open(self.compacting_path, 'a') as dst:
+                dst.write(src.read())
+            os.unlink(self.journal_path)
+        else:
+            os.replace(self.journal_path, self.compacting_path)
+        self._journal = open(self.journal_path, 'a', buffering=1)
+
+        self._snapshot_seq += 1
+        return self._snapshot_seq, json.dumps(self.settings)
+
+    def _discard_compacted(self) -> None:
+        try:
+            os.unlink(self.compacting_path)
+        except FileNotFoundError:
+            pass
+
+    def start(self) -> None:
+        """Start the background compactor on the running event loop"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                snapshot = self._take_snapshot()
+                if snapshot is not None:
+                    await asyncio.to_thread(self._write_snapshot, *snapshot)
+                    self._discard_compacted()
+            except Exception as e:
+                print(f"Error compacting settings: {e}")
+
+    def flush(self) -> None:
+        """Fold the journal into a new snapshot now"""
+        snapshot = self._take_snapshot()
+        if snapshot is not None:
+            self._write_snapshot(*snapshot)
+            self._discard_compacted()
+
+    def close(self) -> None:
+        """Stop the background compactor and fold anything still journaled"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self.flush()
+        self._journal.close()
+
+class SQLiteBackend:
+    """One row per (guild_id, key) in a WAL-journaled SQLite database"""
+
+    def __init__(self, path: str = 'data/settings.db'):
+        self.path = path
+        self.coalesced_writes = 0
+
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS settings ("
+            "guild_id TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "value TEXT, "
+            "PRIMARY KEY (guild_id, key)"
+            ") WITHOUT ROWID"
+        )
+
+    def load_guild(self, guild_id: str) -> Dict[str, Any]:
+        """Load one guild's rows"""
+        return {
+            key: json.loads(value)
+            for key, value in self.db.execute("SELECT key, value FROM settings WHERE guild_id = ?", (guild_id,))
+        }
+
+    def load_setting(self, guild_id: str, setting: str, default: Any = None) -> Any:
+        """Load a single row, decoding only that value"""
+        row = self.db.execute(
+            "SELECT value FROM settings WHERE guild_id = ? AND key = ?", (guild_id, setting)
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else default
+
+    def set(self, guild_id: str, setting: str, value: Any) -> None:
+        self.db.execute(
+            "INSERT INTO settings (guild_id, key, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (guild_id, key) DO UPDATE SET value = excluded.value",
+            (guild_id, setting, json.dumps(value))
+        )
+
+    def set_many(self, rows) -> None:
+        """Upsert (guild_id, key, value) rows in a single transaction"""
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany(
+                "INSERT INTO settings (guild_id, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (guild_id, key) DO UPDATE SET value = excluded.value",
+                ((guild_id, key, json.dumps(value)) for guild_id, key, value in rows)
+            )
+
+    def remove(self, guild_id: str, setting: str) -> None:
+        self.db.execute("DELETE FROM settings WHERE guild_id = ? AND key = ?", (guild_id, setting))
+
+    def clear(self, guild_id: str) -> None:
+        self.db.execute("DELETE FROM settings WHERE guild_id = ?", (guild_id,))
+
+    def start(self) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.db.close()
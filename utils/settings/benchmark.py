@@ -0,0 +1,96 @@
+"""
+Compare the settings backends on a synthetic data set
+Usage: python -m utils.settings.benchmark [--guilds 10000] [--reads 100000] [--allocations]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from .backends import JSONBackend, SQLiteBackend
+from .handler import ServerSettings
+from .migrate import import_json
+
+def make_settings(guilds: int) -> dict:
+    return {
+        str(100000000000000000 + i): {
+            'server_name': f"Guild {i}",
+            'prefix': '>' if i % 7 == 0 else None,
+            'log_channel_messages': 200000000000000000 + i,
+            'starboard_threshold': 3 + i % 5,
+            'tags': {f"tag{t}": {'content': "x" * 200, 'author_id': i} for t in range(i % 4)},
+        }
+        for i in range(guilds)
+    }
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def run(guilds: int, reads: int) -> None:
+    workdir = tempfile.mkdtemp(prefix='settings-bench-')
+    json_path = os.path.join(workdir, 'settings.json')
+    db_path = os.path.join(workdir, 'settings.db')
+
+    with open(json_path, 'w') as f:
+        json.dump(make_settings(guilds), f)
+    import_json(json_path, db_path)
+
+    guild_ids = [100000000000000000 + random.randrange(guilds) for _ in range(reads)]
+
+    for name, factory in [
+        ('json', lambda: JSONBackend(json_path)),
+        ('sqlite', lambda: SQLiteBackend(db_path)),
+    ]:
+        settings, load_time = timed(lambda: ServerSettings(backend=factory()))
+        _, read_time = timed(lambda: [settings.get_all_server_settings(g) for g in guild_ids])
+        _, write_time = timed(lambda: [settings.set_server_setting(g, 'starboard_threshold', 4) for g in guild_ids[:100]])
+        settings.close()
+
+        print(
+            f"{name:>6}: load {load_time * 1000:8.1f}ms | "
+            f"{reads} reads {read_time * 1000:8.1f}ms | "
+            f"100 writes {write_time * 1000:8.1f}ms"
+        )
+
+def allocations(calls: int = 100000) -> None:
+    """Count allocations made by the merged-dict read path versus the cached view"""
+    settings = ServerSettings(backend=JSONBackend(os.path.join(tempfile.mkdtemp(), 'settings.json')))
+    settings.backend.settings.update(make_settings(100))
+    guild_id = 100000000000000042
+
+    for name, read in [
+        ('get_all_server_settings', settings.get_all_server_settings),
+        ('get_server_view', settings.get_server_view),
+    ]:
+        read(guild_id)
+        kept = [None] * calls
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        for i in range(calls):
+            kept[i] = read(guild_id)
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        stats = after.compare_to(before, 'filename')
+        blocks = sum(stat.count_diff for stat in stats)
+        size = sum(stat.size_diff for stat in stats)
+        print(f"{name:>24}: {blocks / calls:6.2f} blocks/call, {size / calls:8.1f} bytes/call")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark settings backends")
+    parser.add_argument('--guilds', type=int, default=10000)
+    parser.add_argument('--reads', type=int, default=100000)
+    parser.add_argument('--allocations', action='store_true', help="Measure read-path allocations instead")
+    args = parser.parse_args()
+
+    if args.allocations:
+        allocations(args.reads)
+    else:
+        run(args.guilds, args.reads)
+
+if __name__ == "__main__":
+    main()
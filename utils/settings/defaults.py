@@ -5,6 +5,7 @@ DEFAULT_SETTINGS = {
     'log_channel_join_leave': None,
     'log_channel_messages': None,
     'log_channel_profiles': None,
+    'log_batch_window': 2,
     'mute_role': None,
     'starboard_channel': None,
     'starboard_threshold': 3,
@@ -0,0 +1,41 @@
+from typing import Any, Dict, Mapping, Optional
+from .defaults import DEFAULT_SETTINGS
+
+def _is_id_setting(setting: str) -> bool:
+    return setting.endswith('_channel') or setting.endswith('_role') or setting.startswith('log_channel_')
+
+def _to_id(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+class GuildConfig:
+    """
+    Typed, read-only snapshot of a guild's DEFAULT_SETTINGS keys
+    Channel and role IDs are converted to int once, unset ones are None
+    """
+
+    __slots__ = ('guild_id', 'log_channels') + tuple(DEFAULT_SETTINGS)
+
+    def __init__(self, guild_id: int, settings: Mapping[str, Any]):
+        self.guild_id = guild_id
+
+        for setting, default in DEFAULT_SETTINGS.items():
+            value = settings.get(setting, default)
+            if _is_id_setting(setting):
+                value = _to_id(value)
+            setattr(self, setting, value)
+
+        self.log_channels: Dict[str, Optional[int]] = {
+            setting[len('log_channel_'):]: getattr(self, setting)
+            for setting in DEFAULT_SETTINGS
+            if setting.startswith('log_channel_')
+        }
+
+    def log_channel(self, log_type: str) -> Optional[int]:
+        """Get the log channel ID for a log type like 'messages' or 'mod_audit'"""
+        return self.log_channels.get(log_type)
+
+    def __repr__(self) -> str:
+        return f"<GuildConfig guild_id={self.guild_id}>"
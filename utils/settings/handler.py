@@ -1,53 +1,188 @@
-import json
 import os
-from typing import Dict, Any, Optional
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Iterable, List, Mapping, Optional, Tuple, Union
+from .backends import JSONBackend, SQLiteBackend
 from .defaults import DEFAULT_SETTINGS
+from .guild import GuildConfig
 
 class ServerSettings:
-    def __init__(self):
-        self.settings_file = 'data/settings.json'
-        self.settings = self._load_settings()
-        
+    def __init__(
+        self,
+        backend: Union[str, JSONBackend, SQLiteBackend] = 'json',
+        flush_interval: float = 5.0,
+        max_guilds: int = 2000,
+        idle_timeout: float = 6 * 60 * 60
+    ):
         os.makedirs('data', exist_ok=True)
 
-    def _load_settings(self) -> Dict[str, Any]:
-        """Load settings from file"""
-        try:
-            with open(self.settings_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+        if backend == 'sqlite':
+            backend = SQLiteBackend()
+        elif backend == 'json':
+            backend = JSONBackend(flush_interval=flush_interval)
 
-    def _save_settings(self) -> None:
-        """Save settings to file"""
-        with open(self.settings_file, 'w') as f:
-            json.dump(self.settings, f, indent=2)
+        self.backend = backend
+        self.max_guilds = max_guilds
+        self.idle_timeout = idle_timeout
 
+        # Guild settings are loaded on first access and kept in access order
+        self._guilds: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._last_access: Dict[int, float] = {}
+
+        self._default_view = MappingProxyType(dict(DEFAULT_SETTINGS))
+        self._views: Dict[int, Mapping[str, Any]] = {}
+        self._configs: Dict[int, GuildConfig] = {}
+
+        self._subscribers: List[Tuple[Callable, Optional[frozenset]]] = []
+
+    @property
+    def coalesced_writes(self) -> int:
+        """Number of mutations absorbed into a shared write"""
+        return self.backend.coalesced_writes
+
+    def start(self) -> None:
+        """Start background persistence on the running event loop"""
+        self.backend.start()
+
+    def flush(self) -> None:
+        """Write pending changes to disk now"""
+        self.backend.flush()
+
+    def close(self) -> None:
+        """Flush pending changes and release the backend"""
+        self.backend.close()
+
+    #################################
+    ## Guild cache
+    #################################
+    def _guild(self, guild_id: int) -> Dict[str, Any]:
+        """Get a guild's stored settings, loading them on first access"""
+        guild_id = int(guild_id)
+        now = time.monotonic()
+
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            guild = self._guilds[guild_id] = self.backend.load_guild(str(guild_id))
+        else:
+            self._guilds.move_to_end(guild_id)
+        self._last_access[guild_id] = now
+        self._evict(now)
+        return guild
+
+    def _evict(self, now: float) -> None:
+        """Drop least recently used guilds over capacity or idle for too long"""
+        while self._guilds:
+            oldest = next(iter(self._guilds))
+            if len(self._guilds) <= self.max_guilds and now - self._last_access[oldest] < self.idle_timeout:
+                break
+            self._forget(oldest)
+
+    def _forget(self, guild_id: int) -> None:
+        self._guilds.pop(guild_id, None)
+        self._last_access.pop(guild_id, None)
+        self._views.pop(guild_id, None)
+        self._configs.pop(guild_id, None)
+
+    @property
+    def loaded_guilds(self) -> int:
+        """Number of guilds currently resident"""
+        return len(self._guilds)
+
+    #################################
+    ## Change notifications
+    #################################
+    def subscribe(self, callback: Callable[[int, str, Any, Any], None], keys: Optional[Iterable[str]] = None) -> None:
+        """
+        Call callback(guild_id, key, old, new) whenever a setting changes
+        Values are effective ones, so a removed setting reports its default as new
+        """
+        self._subscribers.append((callback, frozenset(keys) if keys is not None else None))
+
+    def unsubscribe(self, callback: Callable) -> None:
+        """Stop notifying callback"""
+        self._subscribers = [(cb, keys) for cb, keys in self._subscribers if cb != callback]
+
+    def _notify(self, guild_id: int, setting: str, old: Any, new: Any) -> None:
+        for callback, keys in self._subscribers:
+            if keys is not None and setting not in keys:
+                continue
+            try:
+                callback(guild_id, setting, old, new)
+            except Exception as e:
+                print(f"Error in settings subscriber {callback!r}: {e}")
+
+    #################################
+    ## Settings API
+    #################################
     def get_server_setting(self, guild_id: int, setting: str) -> Optional[Any]:
         """Get a specific setting for a server"""
-        guild_settings = self.settings.get(str(guild_id), {})
-        return guild_settings.get(setting, DEFAULT_SETTINGS.get(setting))
+        return self._guild(guild_id).get(setting, DEFAULT_SETTINGS.get(setting))
+
+    def peek_server_setting(self, guild_id: int, setting: str) -> Optional[Any]:
+        """Get a setting without loading the guild into the cache, for sweeps over every guild"""
+        guild = self._guilds.get(int(guild_id))
+        if guild is None:
+            return self.backend.load_setting(str(int(guild_id)), setting, DEFAULT_SETTINGS.get(setting))
+        return guild.get(setting, DEFAULT_SETTINGS.get(setting))
 
     def get_all_server_settings(self, guild_id: int) -> Dict[str, Any]:
         """Get all settings for a server"""
-        guild_settings = self.settings.get(str(guild_id), {})
-        return {**DEFAULT_SETTINGS, **guild_settings}
+        return {**DEFAULT_SETTINGS, **self._guild(guild_id)}
+
+    def get_server_view(self, guild_id: int) -> Mapping[str, Any]:
+        """Read-only merged settings for a server, rebuilt only when they change"""
+        view = self._views.get(guild_id)
+        if view is not None:
+            self._guilds.move_to_end(guild_id)
+            self._last_access[guild_id] = time.monotonic()
+            return view
+
+        guild_settings = self._guild(guild_id)
+        if not guild_settings:
+            return self._default_view
+        view = self._views[int(guild_id)] = MappingProxyType({**DEFAULT_SETTINGS, **guild_settings})
+        return view
+
+    def get_guild_config(self, guild_id: int) -> GuildConfig:
+        """Typed settings for a server, rebuilt only when they change"""
+        config = self._configs.get(guild_id)
+        if config is not None:
+            self._guilds.move_to_end(guild_id)
+            self._last_access[guild_id] = time.monotonic()
+            return config
+
+        config = self._configs[int(guild_id)] = GuildConfig(int(guild_id), self.get_server_view(guild_id))
+        return config
 
     def set_server_setting(self, guild_id: int, setting: str, value: Any) -> None:
         """Set a specific setting for a server"""
-        if str(guild_id) not in self.settings:
-            self.settings[str(guild_id)] = {}
-            
-        self.settings[str(guild_id)][setting] = value
-        self._save_settings()
+        guild = self._guild(guild_id)
+        old = guild.get(setting, DEFAULT_SETTINGS.get(setting))
+
+        guild[setting] = value
+        self._views.pop(int(guild_id), None)
+        self._configs.pop(int(guild_id), None)
+        self.backend.set(str(guild_id), setting, value)
+        self._notify(int(guild_id), setting, old, value)
 
     def remove_server_setting(self, guild_id: int, setting: str) -> None:
         """Remove a specific setting for a server"""
-        if str(guild_id) in self.settings:
-            self.settings[str(guild_id)].pop(setting, None)
-            self._save_settings()
+        guild = self._guild(guild_id)
+        if setting not in guild:
+            return
+
+        old = guild.pop(setting)
+        self._views.pop(int(guild_id), None)
+        self._configs.pop(int(guild_id), None)
+        self.backend.remove(str(guild_id), setting)
+        self._notify(int(guild_id), setting, old, DEFAULT_SETTINGS.get(setting))
 
     def clear_server_settings(self, guild_id: int) -> None:
         """Clear all settings for a server"""
-        self.settings.pop(str(guild_id), None)
-        self._save_settings() 
\ No newline at end of file
+        old_settings = dict(self._guild(guild_id))
+        self._forget(int(guild_id))
+        self.backend.clear(str(guild_id))
+
+        for setting, old in old_settings.items():
+            self._notify(int(guild_id), setting, old, DEFAULT_SETTINGS.get(setting))
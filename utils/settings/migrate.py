@@ -0,0 +1,38 @@
+"""
+One-shot import of data/settings.json into the SQLite settings backend
+Usage: python -m utils.settings.migrate [--json data/settings.json] [--db data/settings.db]
+"""
+import argparse
+import json
+from .backends import SQLiteBackend
+
+def import_json(json_path: str = 'data/settings.json', db_path: str = 'data/settings.db') -> int:
+    """Copy every guild setting from the JSON file into SQLite, returns the row count"""
+    with open(json_path, 'r') as f:
+        settings = json.load(f)
+
+    rows = [
+        (guild_id, key, value)
+        for guild_id, guild_settings in settings.items()
+        for key, value in guild_settings.items()
+    ]
+
+    backend = SQLiteBackend(db_path)
+    try:
+        backend.set_many(rows)
+    finally:
+        backend.close()
+    return len(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Import settings.json into the SQLite settings backend")
+    parser.add_argument('--json', default='data/settings.json', help="Source settings file")
+    parser.add_argument('--db', default='data/settings.db', help="Target SQLite database")
+    args = parser.parse_args()
+
+    count = import_json(args.json, args.db)
+    print(f"Imported {count} settings into {args.db}")
+    print("Set SETTINGS_BACKEND = 'sqlite' in config.py to use it")
+
+if __name__ == "__main__":
+    main()